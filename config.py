@@ -299,6 +299,10 @@ MISTRAL_IMAGE_MIN_SIZE = _safe_int("MISTRAL_IMAGE_MIN_SIZE", 0)
 # File size limit for Mistral OCR uploads (MB) - reject files exceeding this
 MISTRAL_OCR_MAX_FILE_SIZE_MB = _safe_int("MISTRAL_OCR_MAX_FILE_SIZE_MB", 200, min_val=1)
 
+# PDFs with more pages than this are OCR'd as concurrent page-range requests
+# against a single upload (0 = always one request per document)
+MISTRAL_OCR_CHUNK_PAGES = _safe_int("MISTRAL_OCR_CHUNK_PAGES", 0)
+
 # Increment when Mistral OCR cache metadata schema changes (invalidates old ``mistral_ocr`` entries).
 MISTRAL_OCR_CACHE_CONTRACT_VERSION = 1
 
@@ -393,6 +397,9 @@ VERBOSE_PROGRESS = _safe_bool("VERBOSE_PROGRESS", True)
 
 # Performance
 MAX_CONCURRENT_FILES = _safe_int("MAX_CONCURRENT_FILES", 5, min_val=1)
+# Process-wide cap on OCR requests per second across all worker threads
+# (0 = unlimited). Set to your Mistral quota so concurrent files don't hit 429s.
+MISTRAL_OCR_REQUESTS_PER_SECOND = _safe_float("MISTRAL_OCR_REQUESTS_PER_SECOND", 0.0)
 
 # API cost guardrails
 MAX_BATCH_FILES = _safe_int("MAX_BATCH_FILES", 100)
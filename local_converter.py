@@ -12,9 +12,13 @@ Documentation references:
 
 import csv
 import io
+import itertools
 import re
 import sys
+import tempfile
 import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -32,21 +36,6 @@ __all__ = [
     "analyze_file_content",
 ]
 
-try:
-    from markitdown import (
-        FileConversionException,
-        MarkItDown,
-        MissingDependencyException,
-        StreamInfo,
-        UnsupportedFormatException,
-    )
-except ImportError:
-    MarkItDown = None
-    StreamInfo = None
-    UnsupportedFormatException = None
-    MissingDependencyException = None
-    FileConversionException = None
-
 try:
     import pdfplumber
 except ImportError:
@@ -66,6 +55,25 @@ logger = utils.logger
 # MarkItDown Integration
 # ============================================================================
 
+# MarkItDown pulls in pandas, magika (onnxruntime) and every format converter,
+# which is most of the CLI's start-up time. Its names are bound on first use
+# by _import_markitdown() (None when not installed), so OCR-only runs and the
+# interactive menu never pay for it.
+_MARKITDOWN_NOT_IMPORTED: Any = object()
+_MARKITDOWN_NAMES = (
+    "MarkItDown",
+    "StreamInfo",
+    "UnsupportedFormatException",
+    "MissingDependencyException",
+    "FileConversionException",
+)
+MarkItDown: Any = _MARKITDOWN_NOT_IMPORTED
+StreamInfo: Any = _MARKITDOWN_NOT_IMPORTED
+UnsupportedFormatException: Any = _MARKITDOWN_NOT_IMPORTED
+MissingDependencyException: Any = _MARKITDOWN_NOT_IMPORTED
+FileConversionException: Any = _MARKITDOWN_NOT_IMPORTED
+_markitdown_import_lock = threading.Lock()
+
 _MARKITDOWN_UNSET = object()  # sentinel: init never attempted
 _markitdown_instance = _MARKITDOWN_UNSET
 _markitdown_lock = threading.Lock()
@@ -107,7 +115,30 @@ def _build_markitdown_kwargs() -> Dict[str, Any]:
     return md_kwargs
 
 
-def get_markitdown_instance() -> Optional[MarkItDown]:
+def _import_markitdown() -> None:
+    """
+    Import MarkItDown on first use and bind its names at module level.
+
+    Each name is set to ``None`` when the package is missing. Names that are
+    already bound (including values patched in by tests) are left alone.
+    """
+    module_globals = globals()
+    if all(module_globals[name] is not _MARKITDOWN_NOT_IMPORTED for name in _MARKITDOWN_NAMES):
+        return
+
+    with _markitdown_import_lock:
+        try:
+            import markitdown
+
+            values = {name: getattr(markitdown, name) for name in _MARKITDOWN_NAMES}
+        except ImportError:
+            values = dict.fromkeys(_MARKITDOWN_NAMES)
+        for name, value in values.items():
+            if module_globals[name] is _MARKITDOWN_NOT_IMPORTED:
+                module_globals[name] = value
+
+
+def get_markitdown_instance() -> Optional["MarkItDown"]:
     """
     Create and configure a MarkItDown instance (thread-safe).
 
@@ -126,6 +157,7 @@ def get_markitdown_instance() -> Optional[MarkItDown]:
         if _markitdown_instance is not _MARKITDOWN_UNSET:
             return _markitdown_instance  # pragma: no cover
 
+        _import_markitdown()
         if MarkItDown is None:
             logger.error("MarkItDown not installed. Install with: pip install markitdown")
             _markitdown_instance = None
@@ -172,6 +204,8 @@ def convert_with_markitdown(
     md = get_markitdown_instance()
     if md is None:
         return False, None, "MarkItDown not available"
+    # The except clauses below need the MarkItDown exception classes bound
+    _import_markitdown()
 
     try:
         logger.info("Converting with MarkItDown: %s", file_path.name)
@@ -216,7 +250,7 @@ def convert_with_markitdown(
             # Warn when output contains minimal text (common for scanned
             # images or image-only PDFs processed through MarkItDown).
             ext = file_path.suffix.lower().lstrip(".")
-            if len(markdown_content.strip()) < 50 and ext in (config.IMAGE_EXTENSIONS | {"pdf"}):
+            if len(markdown_content.strip()) < 50 and (ext == "pdf" or ext in config.IMAGE_EXTENSIONS):
                 logger.warning(
                     "Conversion of %s completed but no meaningful text was extracted. "
                     "For scanned or image-based content, consider using Mistral OCR mode.",
@@ -262,6 +296,8 @@ def convert_stream_with_markitdown(
     md = get_markitdown_instance()
     if md is None:
         return False, None, "MarkItDown not available"
+    # StreamInfo and the except clauses below need the MarkItDown names bound
+    _import_markitdown()
 
     if not hasattr(md, "convert_stream"):
         return (
@@ -444,6 +480,27 @@ def _fix_split_headers(table: List[List[str]], max_header_rows: int = 3) -> List
     return table
 
 
+# Merged-cell patterns for _fix_merged_currency_cells (compiled once, not per table)
+
+# Pattern 1: Two dollar-sign values in one cell
+# Matches: "$ 1,234.56 $ 5,678.90" or "$ (1,234.56) $ (5,678.90)"
+_DOUBLE_CURRENCY_RE = re.compile(r"(\$\s*[\(\-]?[\d,]+\.?\d*[\)]?)\s+(\$\s*[\(\-]?[\d,]+\.?\d*[\)]?)")
+
+# Pattern 2: Two bare numbers in one cell (no $ sign)
+# Matches pairs like:
+#   "153,990.37 (235,497.83)"  — positive + parenthetical negative
+#   "55,653.50 55,653.50"     — two positive numbers
+#   "(18,954.54) (31,090.86)" — two parenthetical negatives
+#   "1,456.33 .00"            — number + zero shorthand
+#   ".00 .00"                 — two zero shorthands
+# Each number: optional leading paren/minus, digits with optional commas,
+# optional decimal portion, optional closing paren.
+_NUM = r"(?:\([\d,]+\.?\d*\)|-?\.?\d[\d,]*\.?\d*)"
+_DOUBLE_BARE_NUMBER_RE = re.compile(rf"({_NUM})\s+({_NUM})")
+
+_ASCII_LETTER_RE = re.compile(r"[a-zA-Z]")
+
+
 def _fix_merged_currency_cells(table: List[List[str]]) -> List[List[str]]:
     """
     Fix cells where multiple numeric/currency values are merged into one cell.
@@ -463,78 +520,47 @@ def _fix_merged_currency_cells(table: List[List[str]]) -> List[List[str]]:
     Returns:
         Fixed table with merged value cells properly split
     """
-    # Pattern 1: Two dollar-sign values in one cell
-    # Matches: "$ 1,234.56 $ 5,678.90" or "$ (1,234.56) $ (5,678.90)"
-    double_currency_pattern = re.compile(r"(\$\s*[\(\-]?[\d,]+\.?\d*[\)]?)\s+(\$\s*[\(\-]?[\d,]+\.?\d*[\)]?)")
-
-    # Pattern 2: Two bare numbers in one cell (no $ sign)
-    # Matches pairs like:
-    #   "153,990.37 (235,497.83)"  — positive + parenthetical negative
-    #   "55,653.50 55,653.50"     — two positive numbers
-    #   "(18,954.54) (31,090.86)" — two parenthetical negatives
-    #   "1,456.33 .00"            — number + zero shorthand
-    #   ".00 .00"                 — two zero shorthands
-    # Each number: optional leading paren/minus, digits with optional commas,
-    # optional decimal portion, optional closing paren.
-    _NUM = r"(?:\([\d,]+\.?\d*\)|-?\.?\d[\d,]*\.?\d*)"
-    double_bare_number_pattern = re.compile(rf"({_NUM})\s+({_NUM})")
-
     fixed_table = []
 
     for row in table:
         fixed_row = []
         for cell in row:
-            if not cell or not isinstance(cell, str):
+            split = _split_merged_value_cell(cell) if cell and isinstance(cell, str) else None
+            if split is None:
                 fixed_row.append(cell)
                 continue
-
-            # Strategy 1: Check for dollar-sign pairs (unambiguous)
-            match = double_currency_pattern.search(cell)
-            if match:
-                parts = cell.split("$")
-                if len(parts) >= 3:
-                    first_value = "$" + parts[1].strip()
-                    second_value = "$" + parts[2].strip()
-                    fixed_row.append(first_value)
-                    fixed_row.append(second_value)
-                    logger.debug(
-                        "Split merged currency cell: '%s' → '%s' + '%s'",
-                        cell,
-                        first_value,
-                        second_value,
-                    )
-                    continue
-
-            # Strategy 2: Check for bare number pairs (only in numeric-only cells)
-            # Safety: skip cells containing letters to avoid splitting things like
-            # "10201 Cash - Operating 1" or "Fund 5151 E Broadway"
-            cell_stripped = cell.strip()
-            if cell_stripped and not re.search(r"[a-zA-Z]", cell_stripped):
-                bare_match = double_bare_number_pattern.search(cell_stripped)
-                if bare_match:
-                    first_value = bare_match.group(1).strip()
-                    second_value = bare_match.group(2).strip()
-                    # Validate both parts look like real numbers (not just a stray digit)
-                    if (len(first_value) >= 2 or first_value == ".00") and (
-                        len(second_value) >= 2 or second_value == ".00"
-                    ):
-                        fixed_row.append(first_value)
-                        fixed_row.append(second_value)
-                        logger.debug(
-                            "Split merged bare number cell: '%s' → '%s' + '%s'",
-                            cell_stripped,
-                            first_value,
-                            second_value,
-                        )
-                        continue
-
-            fixed_row.append(cell)
+            logger.debug("Split merged value cell: '%s' → '%s' + '%s'", cell, *split)
+            fixed_row.extend(split)
 
         fixed_table.append(fixed_row)
 
     return fixed_table
 
 
+def _split_merged_value_cell(cell: str) -> Optional[Tuple[str, str]]:
+    """Return the two values merged into *cell*, or None if it holds one value."""
+    # Strategy 1: Check for dollar-sign pairs (unambiguous)
+    if _DOUBLE_CURRENCY_RE.search(cell):
+        parts = cell.split("$")
+        if len(parts) >= 3:
+            return "$" + parts[1].strip(), "$" + parts[2].strip()
+
+    # Strategy 2: Check for bare number pairs (only in numeric-only cells)
+    # Safety: skip cells containing letters to avoid splitting things like
+    # "10201 Cash - Operating 1" or "Fund 5151 E Broadway"
+    cell_stripped = cell.strip()
+    if cell_stripped and not _ASCII_LETTER_RE.search(cell_stripped):
+        bare_match = _DOUBLE_BARE_NUMBER_RE.search(cell_stripped)
+        if bare_match:
+            first_value = bare_match.group(1).strip()
+            second_value = bare_match.group(2).strip()
+            # Validate both parts look like real numbers (not just a stray digit)
+            if (len(first_value) >= 2 or first_value == ".00") and (len(second_value) >= 2 or second_value == ".00"):
+                return first_value, second_value
+
+    return None
+
+
 def extract_all_tables(pdf_path: Path) -> Dict[str, Any]:
     """
     Extract tables from PDF using all available methods.
@@ -653,6 +679,9 @@ def save_tables_to_files(pdf_path: Path, tables: List[List[List[str]]]) -> List[
     created_files = []
     base_name = utils.safe_output_stem(pdf_path)
 
+    # Clean and split each table once; both the markdown and CSV outputs use it
+    normalized = [utils.normalize_table_headers(table) for table in tables]
+
     # Save all tables as markdown (only when "markdown" is in TABLE_OUTPUT_FORMATS)
     if "markdown" in config.TABLE_OUTPUT_FORMATS:
         md_path = config.OUTPUT_MD_DIR / f"{base_name}_tables_all.md"
@@ -664,41 +693,45 @@ def save_tables_to_files(pdf_path: Path, tables: List[List[List[str]]]) -> List[
             additional_fields={"table_count": len(tables)},
         )
 
-        md_content = frontmatter + f"\n# Tables Extracted from {pdf_path.name}\n\n"
-        md_content += f"**Total tables found:** {len(tables)}\n\n"
-
-        for i, table in enumerate(tables, 1):
-            md_content += f"## Table {i}\n\n"
-
-            # Normalize headers and clean the table
-            headers, data_rows = utils.normalize_table_headers(table)
-
+        def _table_block(i: int, table: List[List[str]], headers: List[str], data_rows: List[List[str]]) -> str:
             if headers and data_rows:
-                md_content += utils.format_table_to_markdown(data_rows, headers=headers)
+                table_md = utils.format_table_to_markdown(data_rows, headers=headers)
             else:
                 # Fallback if normalization fails
-                md_content += utils.format_table_to_markdown(table)
-
-            md_content += "\n\n---\n\n"
+                table_md = utils.format_table_to_markdown(table)
+            return f"## Table {i}\n\n{table_md}\n\n---\n\n"
+
+        # Pieces are rendered lazily, one table block at a time
+        md_parts = itertools.chain(
+            (f"{frontmatter}\n# Tables Extracted from {pdf_path.name}\n\n**Total tables found:** {len(tables)}\n\n",),
+            (
+                _table_block(i, table, headers, data_rows)
+                for i, (table, (headers, data_rows)) in enumerate(zip(tables, normalized), 1)
+            ),
+        )
 
-        utils.atomic_write_text(md_path, md_content)
+        if config.GENERATE_TXT_OUTPUT:
+            # The text version is derived from the full markdown, so join once
+            md_content = "".join(md_parts)
+            utils.atomic_write_text(md_path, md_content)
+            utils.save_text_output(md_path, md_content)
+        else:
+            # Nothing else needs the whole document: stream table blocks to the file
+            utils.atomic_write_text(md_path, md_parts)
         created_files.append(md_path)
         logger.info("Saved: %s", md_path.name)
 
-        # Save text version
-        utils.save_text_output(md_path, md_content)
-
     # Save as CSV if requested
     if "csv" in config.TABLE_OUTPUT_FORMATS:
-        for i, table in enumerate(tables, 1):
+        # One buffer and writer, rewound per table
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for i, (headers, data_rows) in enumerate(normalized, 1):
             csv_path = config.OUTPUT_MD_DIR / f"{base_name}_table_{i}.csv"
 
             try:
-                # Normalize headers for CSV as well
-                headers, data_rows = utils.normalize_table_headers(table)
-
-                buf = io.StringIO()
-                writer = csv.writer(buf)
+                buf.seek(0)
+                buf.truncate()
 
                 # Write header row
                 if headers:
@@ -723,6 +756,19 @@ def save_tables_to_files(pdf_path: Path, tables: List[List[List[str]]]) -> List[
 # ============================================================================
 
 
+def _save_page_image(image: Any, image_path: Path) -> None:
+    """Encode one rendered page to *image_path* in ``PDF_IMAGE_FORMAT`` and release it."""
+    try:
+        if config.PDF_IMAGE_FORMAT == "jpeg":
+            image.save(str(image_path), "JPEG", quality=85, optimize=True, progressive=True)
+        elif config.PDF_IMAGE_FORMAT == "png":
+            image.save(str(image_path), "PNG", optimize=True)
+        else:
+            image.save(str(image_path), config.PDF_IMAGE_FORMAT.upper())
+    finally:
+        image.close()
+
+
 def convert_pdf_to_images(
     pdf_path: Path,
     output_dir: Optional[Path] = None,
@@ -769,37 +815,39 @@ def convert_pdf_to_images(
         # Configure poppler path for Windows
         poppler_path = (config.POPPLER_PATH or None) if sys.platform == "win32" else None
 
-        # Build conversion parameters
-        convert_params = {
-            "pdf_path": str(pdf_path),
-            "dpi": dpi,
-            "output_folder": str(output_dir),
-            "fmt": config.PDF_IMAGE_FORMAT,
-            "poppler_path": poppler_path,
-            "thread_count": max(1, thread_count),
-            "use_pdftocairo": config.PDF_IMAGE_USE_PDFTOCAIRO,
-        }
-
-        # Convert PDF to images
-        images = convert_from_path(**convert_params)
-
-        # Save images
-        image_paths = []
+        # Let Poppler render all pages in one call into a scratch directory
+        # (disk-backed, so pages are not held as raw bitmaps in memory); only
+        # the named page_NNN files below are kept in output_dir.
         file_extension = "jpg" if config.PDF_IMAGE_FORMAT == "jpeg" else config.PDF_IMAGE_FORMAT
 
-        for i, image in enumerate(images, 1):
-            image_path = output_dir / f"page_{i:03d}.{file_extension}"
+        with tempfile.TemporaryDirectory(dir=str(output_dir), prefix=".render_") as render_dir:
+            # Build conversion parameters
+            convert_params = {
+                "pdf_path": str(pdf_path),
+                "dpi": dpi,
+                "output_folder": render_dir,
+                "fmt": config.PDF_IMAGE_FORMAT,
+                "poppler_path": poppler_path,
+                "thread_count": max(1, thread_count),
+                "use_pdftocairo": config.PDF_IMAGE_USE_PDFTOCAIRO,
+            }
 
-            # Save with format-specific options
-            if config.PDF_IMAGE_FORMAT == "jpeg":
-                image.save(str(image_path), "JPEG", quality=85, optimize=True, progressive=True)
-            elif config.PDF_IMAGE_FORMAT == "png":
-                image.save(str(image_path), "PNG", optimize=True)
+            # Convert PDF to images
+            images = convert_from_path(**convert_params)
+
+            # Save images (before the scratch files backing them are removed).
+            # Pillow releases the GIL while encoding, so the per-page
+            # decode/encode runs on the same thread budget Poppler used.
+            image_paths = [output_dir / f"page_{i:03d}.{file_extension}" for i in range(1, len(images) + 1)]
+            max_workers = min(len(images), max(1, thread_count))
+            if max_workers <= 1:
+                for image, image_path in zip(images, image_paths):
+                    _save_page_image(image, image_path)
             else:
-                image.save(str(image_path), config.PDF_IMAGE_FORMAT.upper())
-
-            image_paths.append(image_path)
-            logger.debug("Saved page %d to %s", i, image_path.name)
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    # list() re-raises the first save error, as the serial loop did
+                    list(executor.map(_save_page_image, images, image_paths))
+            logger.debug("Saved %d pages to %s", len(image_paths), output_dir)
 
         logger.info(
             "Converted %d pages to %s images",
@@ -873,6 +921,15 @@ def coalesce_tables(tables: List[List[List[str]]]) -> List[List[List[str]]]:
 # ============================================================================
 
 
+# Leading pages sampled to decide whether a PDF has a usable text layer
+_TEXT_SAMPLE_PAGES = 3
+
+
+def _text_vote_decided(text_pages: int, needed: int, remaining: int) -> bool:
+    """True once the text-layer majority vote cannot change (skip further ``extract_text``)."""
+    return text_pages >= needed or text_pages + remaining < needed
+
+
 def _analyze_pdf_text_layer_pypdf(file_path: Path, analysis: Dict[str, Any]) -> None:
     """Lightweight PDF text-layer probe using pypdf (MarkItDown dependency).
 
@@ -889,16 +946,19 @@ def _analyze_pdf_text_layer_pypdf(file_path: Path, analysis: Dict[str, Any]) ->
         reader = PdfReader(str(file_path))
         analysis["page_count"] = len(reader.pages)
 
-        sampled_pages = reader.pages[: min(3, len(reader.pages))]
+        sampled_count = min(_TEXT_SAMPLE_PAGES, len(reader.pages))
+        needed = max(1, (sampled_count + 1) // 2)
         text_pages = 0
 
-        for page in sampled_pages:
+        for checked, page in enumerate(itertools.islice(reader.pages, sampled_count)):
+            if _text_vote_decided(text_pages, needed, sampled_count - checked):
+                break
             text = (page.extract_text() or "").strip()
             if len(text) > 50:
                 text_pages += 1
 
-        if sampled_pages:
-            analysis["is_text_based"] = text_pages >= max(1, (len(sampled_pages) + 1) // 2)
+        if sampled_count:
+            analysis["is_text_based"] = text_pages >= needed
 
         analysis["is_complex"] = (
             analysis["is_complex"]
@@ -910,19 +970,54 @@ def _analyze_pdf_text_layer_pypdf(file_path: Path, analysis: Dict[str, Any]) ->
         logger.debug("pypdf PDF analysis failed: %s", e)
 
 
+# PDF analyses keyed by (resolved path, mtime_ns, size): smart routing, OCR
+# page estimation and page-chunked OCR all analyze the same PDF, and each
+# analysis opens it and samples pages for text and tables.
+_ANALYSIS_MEMO_MAX_ENTRIES = 256
+_analysis_memo: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+_analysis_memo_lock = threading.Lock()
+
+
 def analyze_file_content(file_path: Path) -> Dict[str, Any]:
     """
     Analyze file to determine optimal processing strategy.
 
+    PDF results are memoized per file identity (path, mtime, size), so an
+    unchanged PDF is only opened once per process. A fresh dict is returned
+    on every call.
+
     Args:
         file_path: Path to file
 
     Returns:
         Dictionary with content analysis
     """
+    stat = file_path.stat()
+    file_type = file_path.suffix.lower().lstrip(".")
+    memo_key = None
+    if file_type == "pdf":
+        memo_key = (str(file_path.resolve()), stat.st_mtime_ns, stat.st_size)
+        with _analysis_memo_lock:
+            cached = _analysis_memo.get(memo_key)
+            if cached is not None:
+                _analysis_memo.move_to_end(memo_key)
+                return dict(cached)
+
+    analysis = _analyze_file_content_uncached(file_path, file_type, stat.st_size)
+
+    if memo_key is not None:
+        with _analysis_memo_lock:
+            _analysis_memo[memo_key] = dict(analysis)
+            while len(_analysis_memo) > _ANALYSIS_MEMO_MAX_ENTRIES:
+                _analysis_memo.popitem(last=False)
+    return analysis
+
+
+def _analyze_file_content_uncached(file_path: Path, file_type: str, file_size: int) -> Dict[str, Any]:
+    """Body of ``analyze_file_content`` (no memoization)."""
     analysis = {
-        "file_type": file_path.suffix.lower().lstrip("."),
-        "file_size_mb": file_path.stat().st_size / (1024 * 1024),
+        "file_type": file_type,
+        "file_size_mb": file_size / (1024 * 1024),
         "has_images": False,
         "is_complex": False,
         "page_count": 0,
@@ -938,23 +1033,29 @@ def analyze_file_content(file_path: Path) -> Dict[str, Any]:
                     analysis["page_count"] = len(pdf.pages)
 
                     # Sample up to 3 pages for content type detection
-                    sampled_pages = pdf.pages[: min(3, len(pdf.pages))]
+                    sampled_pages = pdf.pages[: min(_TEXT_SAMPLE_PAGES, len(pdf.pages))]
+                    needed = max(1, (len(sampled_pages) + 1) // 2)
                     text_pages = 0
 
-                    for page in sampled_pages:
-                        text = (page.extract_text() or "").strip()
-                        if len(text) > 50:
-                            text_pages += 1
-
-                        if page.extract_tables():
+                    for checked, page in enumerate(sampled_pages):
+                        # Text extraction walks every content operator on the
+                        # page; stop once the majority vote is settled.
+                        if not _text_vote_decided(text_pages, needed, len(sampled_pages) - checked):
+                            text = (page.extract_text() or "").strip()
+                            if len(text) > 50:
+                                text_pages += 1
+
+                        # Table detection is the costliest probe: once any
+                        # sampled page has a table, skip it for the rest.
+                        if not analysis["has_tables"] and page.extract_tables():
                             analysis["has_tables"] = True
 
-                        if page.images:
+                        if not analysis["has_images"] and page.images:
                             analysis["has_images"] = True
 
                     # Text-based if majority of sampled pages have text
                     if sampled_pages:
-                        analysis["is_text_based"] = text_pages >= max(1, (len(sampled_pages) + 1) // 2)
+                        analysis["is_text_based"] = text_pages >= needed
 
                     # Complex if: multi-page with images OR text-less with tables/images
                     analysis["is_complex"] = (
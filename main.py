@@ -133,7 +133,8 @@ def _process_files_concurrently(
                 logger.error("Failed: %s - %s", file_paths[0].name, err)
         except Exception as e:
             failed += 1
-            logger.error("Error processing %s: %s", file_paths[0].name, e)
+            logger.error("Error processing %s: %s: %s", file_paths[0].name, type(e).__name__, e)
+            logger.debug("Traceback for %s", file_paths[0].name, exc_info=True)
     else:
         with ThreadPoolExecutor(max_workers=config.MAX_CONCURRENT_FILES) as executor:
             futures = {executor.submit(process_fn, fp): fp for fp in file_paths}
@@ -150,7 +151,8 @@ def _process_files_concurrently(
                         logger.error("Failed: %s - %s", file_path.name, err)
                 except Exception as e:
                     failed += 1
-                    logger.error("Error processing %s: %s", file_path.name, e)
+                    logger.error("Error processing %s: %s: %s", file_path.name, type(e).__name__, e)
+                    logger.debug("Traceback for %s", file_path.name, exc_info=True)
 
     utils.ui_print(f"\n{label}: {successful + failed}/{total} complete")
 
@@ -352,6 +354,10 @@ def mode_markitdown_only(file_paths: List[Path]) -> Tuple[bool, str]:
     return failed == 0, f"Processed {successful}/{len(file_paths)} files successfully"
 
 
+# Characters not allowed in a stdin-derived output stem
+_UNSAFE_STEM_CHARS_RE = re.compile(r"[^\w\-. ]+")
+
+
 def mode_markitdown_stdin(stdin_bytes: bytes, filename_hint: str) -> Tuple[bool, str]:
     """Convert stdin bytes with MarkItDown using *filename_hint* for format detection."""
     ok, base, sanit_err = utils.sanitize_stdin_filename_hint(filename_hint)
@@ -370,7 +376,7 @@ def mode_markitdown_stdin(stdin_bytes: bytes, filename_hint: str) -> Tuple[bool,
         stem_raw = hint_path.stem if hint_path.stem else "document"
     else:
         stem_raw = hint_path.name if hint_path.name else "stdin"
-    stem = re.sub(r"[^\w\-. ]+", "_", stem_raw).strip("._ ") or "stdin"
+    stem = _UNSAFE_STEM_CHARS_RE.sub("_", stem_raw).strip("._ ") or "stdin"
     doc_metadata = {
         "file_size_bytes": len(stdin_bytes),
         "file_extension": hint_path.suffix.lower() or "",
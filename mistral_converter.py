@@ -16,22 +16,27 @@ Documentation references:
 """
 
 import base64
+import binascii
+import functools
 import hashlib
 import html
 import ipaddress
+import itertools
 import json
+import operator
 import os
 import re
 import socket
 import sys
 import threading
 import time
-import traceback
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
 from concurrent.futures import TimeoutError as DnsTimeoutError
 from concurrent.futures import as_completed
+from importlib.metadata import version as _pkg_version
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from urllib.parse import urlparse
 
 __all__ = [
@@ -112,6 +117,12 @@ try:
 except ImportError:  # pragma: no cover
     Image = None
 
+try:
+    # Optional SIMD base64 codec; same API (and binascii.Error) as the stdlib
+    from pybase64 import b64decode as _b64decode
+except ImportError:  # pragma: no cover
+    _b64decode = base64.b64decode
+
 import config
 import schemas  # New: JSON schemas for structured extraction
 import utils
@@ -296,8 +307,11 @@ def get_mistral_client() -> Optional[Mistral]:
     """
     global _client_instance
 
-    if _client_instance is not None:
-        return _client_instance
+    # Lock-free fast path once initialized. The global is read once so a
+    # concurrent reset_mistral_client() can't turn the check into a None return.
+    client = _client_instance
+    if client is not None:
+        return client
 
     with _client_lock:
         # Double-checked locking
@@ -346,6 +360,8 @@ def reset_mistral_client() -> None:
     global _client_instance
     with _client_lock:
         _client_instance = None
+    with _recent_uploads_lock:
+        _recent_uploads.clear()
 
 
 # ============================================================================
@@ -353,10 +369,43 @@ def reset_mistral_client() -> None:
 # ============================================================================
 
 
+# HTTP statuses the SDK RetryConfig retries with backoff (see get_retry_config)
+_RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+@functools.lru_cache(maxsize=8)
+def _build_retry_config(
+    retries_module: Any,
+    initial_interval_ms: int,
+    max_interval_ms: int,
+    exponent: float,
+    max_elapsed_time_ms: int,
+    retry_connection_errors: bool,
+) -> Any:
+    """Build (once per distinct setting) the SDK RetryConfig; it is never mutated, so instances are shared."""
+    backoff_strategy = retries_module.BackoffStrategy(
+        initial_interval=initial_interval_ms,
+        max_interval=max_interval_ms,
+        exponent=exponent,
+        max_elapsed_time=max_elapsed_time_ms,
+    )
+    return retries_module.RetryConfig(
+        strategy="backoff",
+        backoff=backoff_strategy,
+        retry_connection_errors=retry_connection_errors,
+    )
+
+
 def get_retry_config() -> Optional[Any]:
     """
     Create RetryConfig for Mistral API calls with exponential backoff.
 
+    The SDK applies it only to 429/500/502/503/504 responses (plus connection
+    errors when ``RETRY_CONNECTION_ERRORS`` is set), so other 4xx errors fail
+    fast. Each wait is ``initial * exponent**attempt`` plus up to 1s of random
+    jitter, capped at ``RETRY_MAX_INTERVAL_MS``, and a ``Retry-After`` header
+    on the response takes precedence over the computed delay.
+
     Returns:
         RetryConfig instance or None if retries module unavailable
     """
@@ -364,25 +413,16 @@ def get_retry_config() -> Optional[Any]:
         return None
 
     try:
-        backoff_strategy = retries.BackoffStrategy(
-            initial_interval=config.RETRY_INITIAL_INTERVAL_MS,
-            max_interval=config.RETRY_MAX_INTERVAL_MS,
-            exponent=config.RETRY_EXPONENT,
-            max_elapsed_time=config.RETRY_MAX_ELAPSED_TIME_MS,
-        )
-
-        retry_config = retries.RetryConfig(
-            strategy="backoff",
-            backoff=backoff_strategy,
-            retry_connection_errors=config.RETRY_CONNECTION_ERRORS,
-        )
-
-        logger.debug(
-            "Retry config: %d attempts, %dms initial interval",
-            config.MAX_RETRIES,
+        # Called for every OCR / chat request: the config object is cached
+        # per distinct setting instead of being rebuilt each time.
+        return _build_retry_config(
+            retries,
             config.RETRY_INITIAL_INTERVAL_MS,
+            config.RETRY_MAX_INTERVAL_MS,
+            config.RETRY_EXPONENT,
+            config.RETRY_MAX_ELAPSED_TIME_MS,
+            config.RETRY_CONNECTION_ERRORS,
         )
-        return retry_config
 
     except Exception as e:
         logger.warning("Error creating retry config: %s", e)
@@ -556,6 +596,21 @@ def get_document_annotation_format(doc_type: str = "auto") -> Optional[Dict[str,
 # Image Optimization
 # ============================================================================
 
+# Optimized/preprocessed PNGs are upload-only temp files (deleted after OCR), so
+# they skip the exhaustive ``optimize`` pass, which costs far more CPU than the
+# bytes it saves.
+_TEMP_PNG_SAVE_KWARGS: Dict[str, Any] = {"format": "PNG", "compress_level": 6}
+
+
+def _fit_within_max_dimension(width: int, height: int) -> Optional[Tuple[int, int]]:
+    """Return the aspect-preserving size that fits ``MISTRAL_MAX_IMAGE_DIMENSION``, or None if already within it."""
+    max_dim = config.MISTRAL_MAX_IMAGE_DIMENSION
+    if width <= max_dim and height <= max_dim:
+        return None
+    if width > height:
+        return max_dim, int(height * (max_dim / width))
+    return int(width * (max_dim / height)), max_dim
+
 
 def optimize_image(image_path: Path) -> Optional[Path]:
     """
@@ -574,22 +629,19 @@ def optimize_image(image_path: Path) -> Optional[Path]:
         resample = Image.Resampling.LANCZOS if hasattr(Image, "Resampling") else Image.LANCZOS
 
         with Image.open(image_path) as src:
-            # Check if optimization needed
-            width, height = src.size
-            max_dim = config.MISTRAL_MAX_IMAGE_DIMENSION
-
-            if width <= max_dim and height <= max_dim:
+            # Check if optimization needed (resize while maintaining aspect ratio)
+            target = _fit_within_max_dimension(*src.size)
+            if target is None:
                 return image_path  # No optimization needed
+            new_width, new_height = target
 
-            # Resize while maintaining aspect ratio
-            if width > height:
-                new_width = max_dim
-                new_height = int(height * (max_dim / width))
-            else:
-                new_height = max_dim
-                new_width = int(width * (max_dim / height))
+            # JPEG: let libjpeg decode at 1/2, 1/4 or 1/8 scale (never below
+            # the target) instead of materialising the full-resolution bitmap.
+            if src.format == "JPEG":
+                src.draft(src.mode, (new_width, new_height))
 
-            img = src.resize((new_width, new_height), resample)
+            # reducing_gap does a cheap integer box reduce before LANCZOS.
+            img = src.resize((new_width, new_height), resample, reducing_gap=3.0)
 
         # Save optimized image with format-appropriate parameters
         optimized_path = image_path.parent / f"{image_path.stem}_optimized{image_path.suffix}"
@@ -597,7 +649,7 @@ def optimize_image(image_path: Path) -> Optional[Path]:
         try:
             suffix = image_path.suffix.lower()
             if suffix == ".png":
-                img.save(optimized_path, format="PNG", optimize=True, compress_level=6)
+                img.save(optimized_path, **_TEMP_PNG_SAVE_KWARGS)
             elif suffix in {".jpg", ".jpeg"}:
                 img.save(
                     optimized_path,
@@ -644,12 +696,24 @@ def preprocess_image(image_path: Path) -> Optional[Path]:
             # Enhance sharpness
             img = ImageEnhance.Sharpness(img).enhance(1.3)
 
-            # Save preprocessed image with format-appropriate parameters
+            # When optimize_image runs next it would decode this file again
+            # just to downscale it; downscale here so the intermediate is
+            # never encoded (and re-read) at full resolution.
+            downscaled = False
+            if config.MISTRAL_ENABLE_IMAGE_OPTIMIZATION:
+                target = _fit_within_max_dimension(*img.size)
+                if target is not None:
+                    resample = Image.Resampling.LANCZOS if hasattr(Image, "Resampling") else Image.LANCZOS
+                    img = img.resize(target, resample, reducing_gap=3.0)
+                    downscaled = True
+
+            # Save preprocessed image with format-appropriate parameters.
             preprocessed_path = image_path.parent / f"{image_path.stem}_preprocessed{image_path.suffix}"
             if image_path.suffix.lower() in {".jpg", ".jpeg"}:
-                img.save(preprocessed_path, format="JPEG", quality=95, optimize=True)
+                quality = config.MISTRAL_IMAGE_QUALITY_THRESHOLD if downscaled else 95
+                img.save(preprocessed_path, format="JPEG", quality=quality, optimize=True)
             elif image_path.suffix.lower() == ".png":
-                img.save(preprocessed_path, format="PNG", optimize=True)
+                img.save(preprocessed_path, **_TEMP_PNG_SAVE_KWARGS)
             else:
                 img.save(preprocessed_path)
         finally:
@@ -855,6 +919,26 @@ def _upload_file_for_ocr_pair(
         _cleanup_temp_files(temp_files_to_cleanup)
 
 
+# Signed URLs of recent uploads, keyed by (client, path, mtime_ns, size), so a
+# second OCR request on the same unchanged file (weak-page re-OCR, document Q&A)
+# reuses the upload instead of sending the bytes again. Bounded LRU.
+_recent_uploads: "OrderedDict[Tuple[Mistral, str, int, int], Tuple[str, float]]" = OrderedDict()
+_recent_uploads_lock = threading.Lock()
+_RECENT_UPLOADS_MAX_ENTRIES = 64
+# Callers start their signed-URL refresh timers when they receive the URL, so a
+# reused URL is already older than they think. Reuse is kept to a short window
+# (and to half the refresh margin) so that skew stays well inside the margin.
+_RECENT_UPLOAD_REUSE_SECONDS = 60.0
+
+
+def _recent_upload_key(client: Mistral, file_path: Path) -> Optional[Tuple[Mistral, str, int, int]]:
+    try:
+        stat = file_path.stat()
+    except OSError:
+        return None
+    return (client, str(file_path), stat.st_mtime_ns, stat.st_size)
+
+
 def upload_file_for_ocr(
     client: Mistral,
     file_path: Path,
@@ -877,8 +961,33 @@ def upload_file_for_ocr(
     Returns:
         Signed URL if successful, None otherwise
     """
-    pair = _upload_file_for_ocr_pair(client, file_path, expiry_hours=expiry_hours)
-    return pair[0] if pair else None
+    if expiry_hours is not None:
+        pair = _upload_file_for_ocr_pair(client, file_path, expiry_hours=expiry_hours)
+        return pair[0] if pair else None
+
+    refresh_margin = (
+        config.MISTRAL_SIGNED_URL_EXPIRY * 3600 * max(0.0, 1.0 - config.MISTRAL_SIGNED_URL_REFRESH_THRESHOLD)
+    )
+    reuse_window = min(_RECENT_UPLOAD_REUSE_SECONDS, refresh_margin / 2)
+    key = _recent_upload_key(client, file_path)
+    if key is not None:
+        with _recent_uploads_lock:
+            recent = _recent_uploads.get(key)
+            if recent is not None and time.time() - recent[1] < reuse_window:
+                _recent_uploads.move_to_end(key)
+                logger.debug("Reusing recent upload of %s", file_path.name)
+                return recent[0]
+
+    pair = _upload_file_for_ocr_pair(client, file_path)
+    if pair is None:
+        return None
+    if key is not None:
+        with _recent_uploads_lock:
+            _recent_uploads[key] = (pair[0], time.time())
+            _recent_uploads.move_to_end(key)
+            while len(_recent_uploads) > _RECENT_UPLOADS_MAX_ENTRIES:
+                _recent_uploads.popitem(last=False)
+    return pair[0]
 
 
 def _cleanup_temp_files(temp_files: List[Path]) -> None:
@@ -929,12 +1038,18 @@ def build_ocr_process_kwargs(
     include_retries: bool,
     pages: Optional[List[int]] = None,
     request_id: Optional[str] = None,
+    include_image_base64: Optional[bool] = None,
 ) -> Dict[str, Any]:
-    """Build kwargs for ``client.ocr.process`` or a batch JSONL line ``body``."""
+    """Build kwargs for ``client.ocr.process`` or a batch JSONL line ``body``.
+
+    ``include_image_base64`` defaults to ``config.MISTRAL_INCLUDE_IMAGES``.
+    """
+    if include_image_base64 is None:
+        include_image_base64 = config.MISTRAL_INCLUDE_IMAGES
     ocr_params: Dict[str, Any] = {
         "model": model,
         "document": document,
-        "include_image_base64": config.MISTRAL_INCLUDE_IMAGES,
+        "include_image_base64": include_image_base64,
     }
     if include_retries:
         ocr_params["retries"] = get_retry_config()
@@ -1007,6 +1122,34 @@ def _prepare_ocr_document(
     return document, signed_url
 
 
+_ocr_rate_lock = threading.Lock()
+_ocr_next_request_at = 0.0
+
+
+def _wait_for_ocr_request_slot() -> None:
+    """
+    Block until this thread may send an OCR request.
+
+    Requests from all worker threads (files and weak-page groups) are spaced
+    ``1 / MISTRAL_OCR_REQUESTS_PER_SECOND`` apart. Each caller reserves its
+    slot under the lock and sleeps outside it, so waiting threads don't
+    serialize on the lock. A rate of 0 disables the limit.
+    """
+    global _ocr_next_request_at
+
+    rate = config.MISTRAL_OCR_REQUESTS_PER_SECOND
+    if rate <= 0:
+        return
+
+    with _ocr_rate_lock:
+        now = time.monotonic()
+        slot = max(now, _ocr_next_request_at)
+        _ocr_next_request_at = slot + 1.0 / rate
+
+    if slot > now:
+        time.sleep(slot - now)
+
+
 def process_with_ocr(
     client: Mistral,
     file_path: Path,
@@ -1015,6 +1158,8 @@ def process_with_ocr(
     progress_callback: Optional[Callable[[str, float], None]] = None,
     signed_url: Optional[str] = None,
     ocr_id: Optional[str] = None,
+    include_image_base64: Optional[bool] = None,
+    count_session_pages: bool = True,
 ) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
     """
     Process file with Mistral OCR.
@@ -1027,6 +1172,10 @@ def process_with_ocr(
         progress_callback: Optional callback for progress updates (message, progress_0_to_1)
         signed_url: Optional pre-obtained signed URL (avoids re-uploading for weak page improvement)
         ocr_id: Optional task identifier for tracking/debugging
+        include_image_base64: Request embedded image data (default: from config);
+            callers that only use page text pass ``False`` to shrink the response
+        count_session_pages: Reserve and commit pages against ``MAX_PAGES_PER_SESSION``;
+            ``False`` when the caller has already reserved the whole document
 
     Returns:
         Tuple of (success, ocr_result_dict, error_message)
@@ -1046,7 +1195,7 @@ def process_with_ocr(
         if validation_error is not None:
             return validation_error
 
-        if config.MAX_PAGES_PER_SESSION > 0:
+        if count_session_pages and config.MAX_PAGES_PER_SESSION > 0:
             if not _reserve_session_pages(estimated_pages):
                 return (
                     False,
@@ -1079,8 +1228,10 @@ def process_with_ocr(
             include_retries=True,
             pages=pages,
             request_id=ocr_id,
+            include_image_base64=include_image_base64,
         )
 
+        _wait_for_ocr_request_slot()
         response = client.ocr.process(**ocr_params)
         _report_progress("Parsing OCR response...", 0.8)
 
@@ -1114,7 +1265,7 @@ def process_with_ocr(
                     reserved_pages,
                     file_path.name,
                 )
-            if config.MAX_PAGES_PER_SESSION > 0:
+            if count_session_pages and config.MAX_PAGES_PER_SESSION > 0:
                 if not _commit_session_pages(reserved_pages, actual_pages):
                     logger.warning(
                         "Session page limit (%d) reached during processing of %s. "
@@ -1140,14 +1291,140 @@ def process_with_ocr(
             )
         elif status_code == 403 or (status_code is None and ("403" in err_str or "Forbidden" in err_str)):
             error_msg = "Access denied to Mistral OCR (403 Forbidden). This feature may require a paid plan."
+        elif status_code in _RETRYABLE_STATUS_CODES:
+            # Transient: the SDK has already backed off and retried until its budget ran out
+            error_msg = (
+                f"Mistral OCR still unavailable (HTTP {status_code}) after retrying for up to "
+                f"{config.RETRY_MAX_ELAPSED_TIME_MS} ms: {e}. Try again later or raise RETRY_MAX_ELAPSED_TIME_MS."
+            )
 
         logger.error(error_msg)
+        # Full traceback only when DEBUG is enabled; handlers format it lazily
+        logger.debug("OCR request traceback for %s", file_path.name, exc_info=True)
         return False, None, error_msg
     finally:
         if reserved_pages:
             _release_session_pages_reservation(reserved_pages)
 
 
+def _merge_chunk_results(file_path: Path, chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine page-range OCR results (in request order) into one document result."""
+    merged = dict(chunks[0])
+    merged["pages"] = [page for chunk in chunks for page in chunk.get("pages") or ()]
+    _order_pages_by_index(merged["pages"])
+    # Each chunk was sent MISTRAL_IMAGE_LIMIT on its own; keep the document-wide cap
+    if config.MISTRAL_IMAGE_LIMIT > 0:
+        remaining = config.MISTRAL_IMAGE_LIMIT
+        for i, page in enumerate(merged["pages"]):
+            images = page.get("images") or []
+            if len(images) > remaining:
+                merged["pages"][i] = dict(page, images=images[:remaining])
+            remaining = max(0, remaining - len(images))
+    merged["full_text"] = _join_page_texts(merged["pages"])
+    merged["bbox_annotations"] = [bbox for chunk in chunks for bbox in chunk.get("bbox_annotations") or ()]
+    # A document annotation describes the whole file; each chunk only saw part
+    # of it, so the first one that has an annotation is kept.
+    merged["document_annotation"] = next(
+        (chunk["document_annotation"] for chunk in chunks if chunk.get("document_annotation")), None
+    )
+    merged["parse_error"] = next((chunk["parse_error"] for chunk in chunks if chunk.get("parse_error")), None)
+    usage = dict(merged.get("usage_info") or {})
+    pages_processed = [(chunk.get("usage_info") or {}).get("pages_processed") for chunk in chunks]
+    if all(isinstance(n, int) for n in pages_processed):
+        usage["pages_processed"] = sum(pages_processed)
+    merged["usage_info"] = usage
+    merged["file_name"] = file_path.name
+    return merged
+
+
+def _process_pdf_in_page_chunks(
+    client: Mistral, file_path: Path, page_count: int
+) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
+    """
+    OCR a long PDF as concurrent page-range requests against one upload.
+
+    The file is uploaded once and each ``MISTRAL_OCR_CHUNK_PAGES`` range is
+    sent as its own request (each retried by the SDK on its own), so a long
+    document costs the slowest chunk's round trip instead of one request for
+    every page. Any failed chunk fails the document, as a single request would,
+    and chunks not yet started are cancelled. The whole page count is reserved
+    against ``MAX_PAGES_PER_SESSION`` once, before any chunk is sent.
+    """
+    size = config.MISTRAL_OCR_CHUNK_PAGES
+    ranges = [list(range(start, min(start + size, page_count))) for start in range(0, page_count, size)]
+
+    file_size_mb = file_path.stat().st_size / (1024 * 1024)
+    validation_error = _validate_file_for_ocr(file_path, file_size_mb)
+    if validation_error is not None:
+        return validation_error
+
+    reserved_pages = 0
+    if config.MAX_PAGES_PER_SESSION > 0:
+        reserved_pages = min(page_count, config.MAX_PAGES_PER_SESSION)
+        if not _reserve_session_pages(reserved_pages):
+            return (
+                False,
+                None,
+                (
+                    f"Session page limit reached ({config.MAX_PAGES_PER_SESSION}). "
+                    "Start a new session or increase MAX_PAGES_PER_SESSION."
+                ),
+            )
+
+    try:
+        signed_url = upload_file_for_ocr(client, file_path)
+        if not signed_url:
+            return False, None, "Failed to upload file"
+
+        logger.info("OCR of %s split into %d requests of up to %d pages", file_path.name, len(ranges), size)
+
+        def _ocr_range(pages: List[int]) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
+            return process_with_ocr(client, file_path, pages=pages, signed_url=signed_url, count_session_pages=False)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(ranges)
+        # Same nested-pool cap as weak-page re-OCR (this runs inside the per-file pool)
+        max_workers = min(len(ranges), config.OCR_MAX_WEAK_PAGE_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(_ocr_range, pages): i for i, pages in enumerate(ranges)}
+            for future in as_completed(futures):
+                ok, result, error = future.result()
+                if not ok:
+                    for pending in futures:
+                        pending.cancel()
+                    pages = ranges[futures[future]]
+                    return False, None, f"OCR failed for pages {pages[0] + 1}-{pages[-1] + 1}: {error}"
+                results[futures[future]] = result
+
+        merged = _merge_chunk_results(file_path, [result for result in results if result])
+        if reserved_pages:
+            if not _commit_session_pages(reserved_pages, _ocr_session_page_delta(merged)):
+                logger.warning(
+                    "Session page limit (%d) reached during processing of %s. "
+                    "Returning result but further OCR requests will be refused.",
+                    config.MAX_PAGES_PER_SESSION,
+                    file_path.name,
+                )
+            reserved_pages = 0
+        return True, merged, None
+    finally:
+        if reserved_pages:
+            _release_session_pages_reservation(reserved_pages)
+
+
+def _ocr_document(client: Mistral, file_path: Path) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
+    """OCR a whole document: long PDFs in concurrent page-range chunks when enabled, else one request."""
+    if config.MISTRAL_OCR_CHUNK_PAGES > 0 and file_path.suffix.lower() == ".pdf":
+        try:
+            import local_converter as _lc
+
+            page_count = int(_lc.analyze_file_content(file_path).get("page_count") or 0)
+        except (OSError, ImportError, ValueError):
+            page_count = 0
+        if page_count > config.MISTRAL_OCR_CHUNK_PAGES:
+            return _process_pdf_in_page_chunks(client, file_path, page_count)
+    return process_with_ocr(client, file_path)
+
+
 def _extract_page_text(page: Any) -> str:
     """Extract text content from a single OCR page object."""
     if hasattr(page, "markdown") and page.markdown:
@@ -1229,11 +1506,7 @@ def _parse_page_object(page: Any, idx: int) -> Dict[str, Any]:
         # Expand table placeholder links in page text with actual table content.
         # The API returns placeholders like [tbl-0.md](tbl-0.md) and stores the
         # real table data in the tables array.
-        for tbl in page_data["tables"]:
-            tbl_id = tbl.get("id", "") if isinstance(tbl, dict) else ""
-            tbl_content = tbl.get("content", "") if isinstance(tbl, dict) else ""
-            if tbl_id and tbl_content:
-                page_data["text"] = page_data["text"].replace(f"[{tbl_id}]({tbl_id})", tbl_content)
+        page_data["text"] = _expand_table_placeholders(page_data["text"], page_data["tables"])
 
     # Hyperlinks
     if hasattr(page, "hyperlinks") and page.hyperlinks:
@@ -1248,13 +1521,52 @@ def _parse_page_object(page: Any, idx: int) -> Dict[str, Any]:
     return page_data
 
 
+# ``[tbl-0.md](tbl-0.md)``: link text and target are the same table id.
+_TABLE_PLACEHOLDER_RE = re.compile(r"\[([^\[\]()]+)\]\(\1\)")
+
+
+def _expand_table_placeholders(text: str, tables: List[Any]) -> str:
+    """Replace ``[id](id)`` table placeholders in *text* with the table content.
+
+    One regex pass with a dict lookup per match, instead of one full-text
+    ``str.replace`` scan (and copy) per table on the page.
+    """
+    contents = {
+        tbl.get("id"): tbl.get("content")
+        for tbl in tables
+        if isinstance(tbl, dict) and tbl.get("id") and tbl.get("content")
+    }
+    if not contents or not text:
+        return text
+    return _TABLE_PLACEHOLDER_RE.sub(lambda m: contents.get(m.group(1), m.group(0)), text)
+
+
+def _join_page_texts(pages: List[Dict[str, Any]]) -> str:
+    """Concatenate non-empty page texts (each followed by a blank line) in one join.
+
+    Replaces per-page ``full_text +=`` appends, which re-copy the growing
+    document for every page.
+    """
+    return "".join([f"{page['text']}\n\n" for page in pages if page["text"]])
+
+
+def _order_pages_by_index(pages: List[Dict[str, Any]]) -> None:
+    """Sort parsed *pages* by ``api_page_index`` in place (stable).
+
+    The API returns pages in order, so one monotonicity pass usually finds
+    nothing to do and the sort is skipped.
+    """
+    indices = [page["api_page_index"] for page in pages]
+    if any(map(operator.gt, indices, itertools.islice(indices, 1, None))):
+        pages.sort(key=operator.itemgetter("api_page_index"))
+
+
 def _parse_pages_response(response: Any, result: Dict[str, Any]) -> None:
     """Parse a multi-page OCR response (``response.pages``) into *result*."""
     for idx, page in enumerate(response.pages):
-        page_data = _parse_page_object(page, idx)
-        result["pages"].append(page_data)
-        if page_data["text"]:
-            result["full_text"] += page_data["text"] + "\n\n"
+        result["pages"].append(_parse_page_object(page, idx))
+    _order_pages_by_index(result["pages"])
+    result["full_text"] += _join_page_texts(result["pages"])
 
 
 def _parse_single_text_response(text: str, result: Dict[str, Any]) -> None:
@@ -1272,11 +1584,7 @@ def _parse_dict_response(response: dict, result: Dict[str, Any]) -> None:
             page_text = html.unescape(utils.clean_consecutive_duplicates(page_text))
             # Expand table placeholder links with actual content
             tables = page.get("tables", [])
-            for tbl in tables:
-                tbl_id = tbl.get("id", "") if isinstance(tbl, dict) else ""
-                tbl_content = tbl.get("content", "") if isinstance(tbl, dict) else ""
-                if tbl_id and tbl_content:
-                    page_text = page_text.replace(f"[{tbl_id}]({tbl_id})", tbl_content)
+            page_text = _expand_table_placeholders(page_text, tables)
             raw_index = page.get("index")
             if raw_index is not None:
                 try:
@@ -1295,8 +1603,8 @@ def _parse_dict_response(response: dict, result: Dict[str, Any]) -> None:
                     "tables": tables,
                 }
             )
-            if page_text:
-                result["full_text"] += page_text + "\n\n"
+        _order_pages_by_index(result["pages"])
+        result["full_text"] += _join_page_texts(result["pages"])
     else:
         text = response.get("markdown", response.get("text", ""))
         if text:
@@ -1314,7 +1622,7 @@ def _extract_structured_outputs(response: Any, result: Dict[str, Any]) -> None:
         annotation = response.document_annotation
         if isinstance(annotation, str):
             try:
-                result["document_annotation"] = json.loads(annotation)
+                result["document_annotation"] = utils.json_loads(annotation)
             except (json.JSONDecodeError, TypeError):
                 result["document_annotation"] = annotation
         elif hasattr(annotation, "model_dump"):
@@ -1396,7 +1704,9 @@ def _parse_ocr_response(response: Any, file_path: Path) -> Dict[str, Any]:
 
     except Exception as e:
         logger.error("Error parsing OCR response: %s", e)
-        logger.debug("Traceback: %s", traceback.format_exc())
+        # exc_info defers traceback formatting to the handler, so nothing is
+        # formatted unless DEBUG records are actually emitted.
+        logger.debug("OCR response parse traceback", exc_info=True)
         result["parse_error"] = str(e)
 
     return result
@@ -1412,6 +1722,10 @@ def _parse_ocr_response(response: Any, file_path: Path) -> Dict[str, Any]:
 # Configurable via config.OCR_MAX_WEAK_PAGE_WORKERS.
 
 
+_PAGE_REF_RE = re.compile(r"Page\s+\d+")
+_UNIQUENESS_SCAN_CHUNK = 128
+
+
 def _is_weak_page(text: str) -> bool:
     """
     Detect if OCR page text is weak or low-quality.
@@ -1433,11 +1747,12 @@ def _is_weak_page(text: str) -> bool:
     Returns:
         True if page appears to have weak OCR results
     """
-    if not text or len(text.strip()) < 10:
+    stripped_len = len(text.strip()) if text else 0
+    if stripped_len < 10:
         return True
 
     # Check 1: Very short text (configurable via OCR_MIN_TEXT_LENGTH)
-    if len(text.strip()) < config.OCR_MIN_TEXT_LENGTH:
+    if stripped_len < config.OCR_MIN_TEXT_LENGTH:
         return True
 
     # Check 2: Token uniqueness ratio (detect heavy repetition)
@@ -1446,26 +1761,34 @@ def _is_weak_page(text: str) -> bool:
     if not tokens:  # pragma: no cover – unreachable after len(text.strip()) >= 10
         return True
 
-    unique_tokens = set(tokens)
-    uniqueness_ratio = len(unique_tokens) / len(tokens)
-
-    if uniqueness_ratio < config.OCR_MIN_UNIQUENESS_RATIO:
-        logger.debug("Low uniqueness ratio: %.2f", uniqueness_ratio)
+    # Hash tokens a slice at a time and stop once enough distinct ones have
+    # been seen to pass: most pages clear the ratio well before their end.
+    n_tokens = len(tokens)
+    unique_tokens: set = set()
+    for start in range(0, n_tokens, _UNIQUENESS_SCAN_CHUNK):
+        unique_tokens.update(tokens[start : start + _UNIQUENESS_SCAN_CHUNK])
+        if len(unique_tokens) / n_tokens >= config.OCR_MIN_UNIQUENESS_RATIO:
+            break
+    else:
+        logger.debug("Low uniqueness ratio: %.2f", len(unique_tokens) / n_tokens)
         return True
 
     # Check 3: Detect repeated header patterns
     # Use regex to catch all "Page N" patterns, not just a hardcoded few
     # Configurable via OCR_MAX_PHRASE_REPETITIONS
-    page_refs = re.findall(r"Page\s+\d+", text)
-    if len(page_refs) > config.OCR_MAX_PHRASE_REPETITIONS:
-        logger.debug("Repeated page references found %s times", len(page_refs))
+    # Stop scanning as soon as the limit is exceeded
+    max_refs = config.OCR_MAX_PHRASE_REPETITIONS
+    page_ref_count = sum(1 for _ in itertools.islice(_PAGE_REF_RE.finditer(text), max_refs + 1))
+    if page_ref_count > max_refs:
+        logger.debug("More than %s repeated page references found", max_refs)
         return True
 
     # Check 4: Average line length (very short lines suggest parsing issues)
     # Configurable via OCR_MIN_AVG_LINE_LENGTH
-    lines = [line.strip() for line in text.split("\n") if line.strip()]
-    if lines:
-        avg_line_length = sum(len(line) for line in lines) / len(lines)
+    # One C-level pipeline over the lines; blank lines have length 0 and drop out
+    line_lengths = list(filter(None, map(len, map(str.strip, text.split("\n")))))
+    if line_lengths:
+        avg_line_length = sum(line_lengths) / len(line_lengths)
         if avg_line_length < config.OCR_MIN_AVG_LINE_LENGTH:
             logger.debug("Short average line length: %.1f", avg_line_length)
             return True
@@ -1473,12 +1796,35 @@ def _is_weak_page(text: str) -> bool:
     return False
 
 
-def assess_ocr_quality(ocr_result: Dict[str, Any]) -> Dict[str, Any]:
+# First through last non-whitespace character: the span ``str.strip`` would keep
+_STRIPPED_SPAN_RE = re.compile(r"\S(?:.*\S)?", re.DOTALL)
+
+
+def _stripped_length(text: str) -> int:
+    """Return ``len(text.strip())`` without copying *text*."""
+    match = _STRIPPED_SPAN_RE.search(text)
+    return match.end() - match.start() if match else 0
+
+
+def _count_digits(text: str) -> int:
+    """Count the characters of *text* for which ``str.isdigit`` is true."""
+    if text.isascii():
+        # ASCII (the usual case): ten C-level str.count scans instead of a
+        # per-character isdigit call over the whole document
+        return sum(map(text.count, "0123456789"))
+    return sum(map(str.isdigit, text))
+
+
+def assess_ocr_quality(ocr_result: Dict[str, Any], recheck_pages: Optional[List[int]] = None) -> Dict[str, Any]:
     """
     Assess the quality of OCR results to determine if they should be used.
 
     Args:
         ocr_result: OCR result dictionary
+        recheck_pages: When re-assessing after ``improve_weak_pages``, the weak
+            page indices from the previous assessment. Only these pages can
+            have changed, so only they are re-checked; every other page is
+            known to have passed.
 
     Returns:
         Dictionary with quality assessment:
@@ -1487,6 +1833,7 @@ def assess_ocr_quality(ocr_result: Dict[str, Any]) -> Dict[str, Any]:
             "quality_score": float,       # 0-100 score
             "issues": List[str],          # List of quality issues found
             "weak_page_count": int,       # Number of weak pages
+            "weak_page_indices": List[int],  # 0-based indices of the weak pages
             "total_page_count": int,      # Total pages analyzed
             "digit_count": int,           # Total digits extracted
             "uniqueness_ratio": float,    # Token uniqueness across all pages
@@ -1500,25 +1847,26 @@ def assess_ocr_quality(ocr_result: Dict[str, Any]) -> Dict[str, Any]:
         "quality_score": 100.0,
         "issues": [],
         "weak_page_count": 0,
+        "weak_page_indices": [],
         "total_page_count": len(pages),
         "digit_count": 0,
         "uniqueness_ratio": 0.0,
     }
 
-    if not full_text or len(full_text.strip()) < 50:
+    # Measured in place: stripping would copy the whole document just to size it
+    if not full_text or _stripped_length(full_text) < 50:
         assessment["is_usable"] = False
         assessment["quality_score"] = 0.0
         assessment["issues"].append("Minimal text extracted")
         return assessment
 
-    # Count weak pages
-    for page in pages:
-        page_text = page.get("text", "")
-        if _is_weak_page(page_text):
-            assessment["weak_page_count"] += 1
+    # Count weak pages (indices are kept so improve_weak_pages need not re-scan every page)
+    weak_indices = _detect_weak_pages(ocr_result, recheck_pages)
+    assessment["weak_page_indices"] = weak_indices
+    assessment["weak_page_count"] = len(weak_indices)
 
     # Calculate metrics
-    assessment["digit_count"] = sum(1 for char in full_text if char.isdigit())
+    assessment["digit_count"] = _count_digits(full_text)
 
     tokens = full_text.split()
     if tokens:
@@ -1556,42 +1904,81 @@ def assess_ocr_quality(ocr_result: Dict[str, Any]) -> Dict[str, Any]:
     return assessment
 
 
-def _detect_weak_pages(ocr_result: Dict[str, Any]) -> List[int]:
-    """Return indices of pages whose OCR text is considered weak."""
+def _detect_weak_pages(ocr_result: Dict[str, Any], indices: Optional[List[int]] = None) -> List[int]:
+    """Return indices of pages whose OCR text is considered weak (only among *indices* when given)."""
+    pages = ocr_result.get("pages") or []
     weak_pages = []
-    for i, page in enumerate(ocr_result["pages"]):
-        text = page.get("text", "")
+    for i in range(len(pages)) if indices is None else sorted(i for i in indices if 0 <= i < len(pages)):
+        text = pages[i].get("text", "")
         if _is_weak_page(text):
             weak_pages.append(i)
             logger.debug("Page %s has weak OCR result (%s chars)", i + 1, len(text))
     return weak_pages
 
 
+def _group_weak_pages(weak_pages: List[int]) -> List[List[int]]:
+    """Split *weak_pages* into at most ``OCR_MAX_WEAK_PAGE_WORKERS`` groups (one OCR request each).
+
+    Round-robin keeps groups balanced and each group in ascending page order.
+    """
+    n_groups = min(len(weak_pages), config.OCR_MAX_WEAK_PAGE_WORKERS)
+    return [weak_pages[i::n_groups] for i in range(n_groups)]
+
+
 def _run_weak_page_improvements(
-    weak_pages: List[int],
-    improve_fn: Callable[[int], Tuple[int, Optional[Dict[str, Any]]]],
+    page_groups: List[List[int]],
+    improve_fn: Callable[[List[int]], List[Tuple[int, Optional[Dict[str, Any]]]]],
     ocr_result: Dict[str, Any],
-) -> None:
-    """Execute *improve_fn* across *weak_pages* in a thread pool, mutating *ocr_result*."""
-    max_workers = min(len(weak_pages), config.OCR_MAX_WEAK_PAGE_WORKERS)
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(improve_fn, idx): idx for idx in weak_pages}
+) -> int:
+    """
+    Execute *improve_fn* for each group of weak pages in a thread pool, mutating *ocr_result*.
+
+    Returns the number of pages whose text was replaced.
+    """
+    improved_count = 0
+
+    def _apply(page_idx: int, improved_page: Optional[Dict[str, Any]]) -> None:
+        nonlocal improved_count
+        if improved_page is None:
+            return
+        original_len = len(ocr_result["pages"][page_idx].get("text", ""))
+        improved_len = len(improved_page.get("text", ""))
+        if improved_len > original_len:
+            logger.info("Improved page %d", page_idx + 1)
+            ocr_result["pages"][page_idx]["text"] = improved_page.get("text", "")
+            improved_count += 1
+
+    if len(page_groups) <= 1:
+        # Nothing to overlap: run in the calling thread without pool setup
+        for group in page_groups:
+            try:
+                for page_idx, improved_page in improve_fn(group):
+                    _apply(page_idx, improved_page)
+            except Exception as e:
+                logger.warning("Unexpected error retrieving page improvement result: %s", e)
+        return improved_count
+
+    with ThreadPoolExecutor(max_workers=len(page_groups)) as executor:
+        futures = [executor.submit(improve_fn, group) for group in page_groups]
         for future in as_completed(futures):
             try:
-                page_idx, improved_page = future.result()
+                results = future.result()
             except Exception as e:
                 logger.warning("Unexpected error retrieving page improvement result: %s", e)
                 continue
-            if improved_page is None:
-                continue
-            original_len = len(ocr_result["pages"][page_idx].get("text", ""))
-            improved_len = len(improved_page.get("text", ""))
-            if improved_len > original_len:
-                logger.info("Improved page %d", page_idx + 1)
-                ocr_result["pages"][page_idx]["text"] = improved_page.get("text", "")
+            for page_idx, improved_page in results:
+                _apply(page_idx, improved_page)
+    return improved_count
 
 
-def improve_weak_pages(client: Mistral, file_path: Path, ocr_result: Dict[str, Any], model: str) -> Dict[str, Any]:
+def improve_weak_pages(
+    client: Mistral,
+    file_path: Path,
+    ocr_result: Dict[str, Any],
+    model: str,
+    weak_pages: Optional[List[int]] = None,
+    use_cache: bool = False,
+) -> Dict[str, Any]:
     """
     Re-OCR weak pages with low confidence or short text.
 
@@ -1610,6 +1997,10 @@ def improve_weak_pages(client: Mistral, file_path: Path, ocr_result: Dict[str, A
         file_path: Path to original file
         ocr_result: Initial OCR result (modified in place)
         model: Model to use
+        weak_pages: Pre-computed weak page indices (e.g. ``weak_page_indices`` from
+            ``assess_ocr_quality``); detected here when omitted
+        use_cache: Reuse re-OCR'd pages cached for this file content and model, and
+            cache fresh ones (``mistral_ocr_pages`` entry)
 
     Returns:
         The same *ocr_result* dict, with weak pages replaced where improvement was found.
@@ -1619,12 +2010,40 @@ def improve_weak_pages(client: Mistral, file_path: Path, ocr_result: Dict[str, A
 
     logger.info("Analyzing pages for weak OCR results...")
 
-    weak_pages = _detect_weak_pages(ocr_result)
+    if weak_pages is None:
+        weak_pages = _detect_weak_pages(ocr_result)
 
     if not weak_pages:
         logger.info("No weak pages detected")
         return ocr_result
 
+    def _page_key(page_idx: int) -> str:
+        return f"{model}:{ocr_result['pages'][page_idx].get('api_page_index', page_idx)}"
+
+    page_contract: Optional[Dict[str, Any]] = None
+    cached_pages: Dict[str, Any] = {}
+    if use_cache:
+        page_contract = _weak_page_cache_contract()
+        entry = utils.cache.get_entry(file_path, cache_type="mistral_ocr_pages")
+        if entry and mistral_ocr_cache_contract_matches(entry.get("metadata"), page_contract):
+            stored = (entry.get("data") or {}).get("pages")
+            if isinstance(stored, dict):
+                cached_pages = stored
+
+    # Pages re-OCR'd by an earlier run on identical bytes are replayed without an API call
+    hits = [i for i in weak_pages if _page_key(i) in cached_pages]
+    improved_count = 0
+    if hits:
+        logger.info("Using cached re-OCR results for %d weak pages", len(hits))
+        improved_count = _run_weak_page_improvements(
+            [hits], lambda group: [(i, cached_pages[_page_key(i)]) for i in group], ocr_result
+        )
+        weak_pages = [i for i in weak_pages if _page_key(i) not in cached_pages]
+        if not weak_pages:
+            if improved_count:
+                ocr_result["full_text"] = "\n\n".join(page.get("text", "") for page in ocr_result["pages"])
+            return ocr_result
+
     logger.info("Re-processing %s weak pages...", len(weak_pages))
 
     # Upload file ONCE and reuse the signed URL for all weak pages.
@@ -1656,29 +2075,52 @@ def improve_weak_pages(client: Mistral, file_path: Path, ocr_result: Dict[str, A
                     logger.warning("Re-upload failed: %s", e)
             return signed_url
 
-    def _improve_page(page_idx: int) -> Tuple[int, Optional[Dict[str, Any]]]:
-        """Re-OCR a single page; returns (page_idx, improved_page_data) or (page_idx, None)."""
+    fresh_pages: Dict[str, Any] = {}
+    _fresh_lock = threading.Lock()
+
+    def _improve_group(group: List[int]) -> List[Tuple[int, Optional[Dict[str, Any]]]]:
+        """Re-OCR a group of pages in one request; returns (page_idx, improved_page_data or None) pairs."""
+        results = _request_group(group)
+        if use_cache:
+            with _fresh_lock:
+                fresh_pages.update((_page_key(i), page) for i, page in results if page is not None)
+        return results
+
+    def _request_group(group: List[int]) -> List[Tuple[int, Optional[Dict[str, Any]]]]:
         try:
             url = _refresh_url_if_needed()
-            page_entry = ocr_result["pages"][page_idx]
-            ocr_page_spec = page_entry.get("api_page_index", page_idx)
+            page_specs = [ocr_result["pages"][i].get("api_page_index", i) for i in group]
             ok, improved_result, _ = process_with_ocr(
                 client,
                 file_path,
                 model=model,
-                pages=[ocr_page_spec],
+                pages=page_specs,
                 signed_url=url,
+                # Only the page text is kept; image base64 would just bloat the response
+                include_image_base64=False,
             )
             if ok and improved_result and improved_result.get("pages"):
-                return page_idx, improved_result["pages"][0]
+                returned = improved_result["pages"]
+                by_index = {p.get("api_page_index"): p for p in returned}
+                if all(spec in by_index for spec in page_specs):
+                    return [(i, by_index[spec]) for i, spec in zip(group, page_specs)]
+                if len(returned) == len(group):
+                    # No usable page indices in the response: pages come back in request order
+                    return list(zip(group, returned))
         except Exception as e:
-            logger.warning("Error improving page %d: %s", page_idx + 1, e)
-        return page_idx, None
+            logger.warning("Error improving pages %s: %s", [i + 1 for i in group], e)
+        return [(i, None) for i in group]
 
-    _run_weak_page_improvements(weak_pages, _improve_page, ocr_result)
+    # Weak pages are coalesced into at most OCR_MAX_WEAK_PAGE_WORKERS
+    # multi-page requests (run concurrently), so N weak pages cost a few
+    # round trips instead of N. Full text is rebuilt only if a page changed.
+    improved_count += _run_weak_page_improvements(_group_weak_pages(weak_pages), _improve_group, ocr_result)
+    if improved_count:
+        ocr_result["full_text"] = "\n\n".join(page.get("text", "") for page in ocr_result["pages"])
 
-    # Rebuild full text
-    ocr_result["full_text"] = "\n\n".join(page.get("text", "") for page in ocr_result["pages"])
+    if fresh_pages:
+        cached_pages.update(fresh_pages)
+        utils.cache.set(file_path, {"pages": cached_pages}, cache_type="mistral_ocr_pages", metadata=page_contract)
 
     return ocr_result
 
@@ -1688,55 +2130,131 @@ def improve_weak_pages(client: Mistral, file_path: Path, ocr_result: Dict[str, A
 # ============================================================================
 
 
-def save_extracted_images(ocr_result: Dict[str, Any], file_path: Path) -> List[Path]:
+_BASE64_DECODE_CHUNK_CHARS = 4 * 64 * 1024  # multiple of 4 so chunks align to base64 quanta
+
+
+def _iter_base64_decoded(data: str, start: int = 0) -> Iterator[bytes]:
+    """
+    Decode base64 *data* (from offset *start*) in fixed-size chunks.
+
+    Keeps peak memory at one chunk instead of the whole decoded image. Chunks
+    are decoded strictly; the first chunk containing anything else (line
+    breaks, stray characters) triggers a lenient decode of the remainder,
+    which is exact because every earlier chunk was whole, valid quanta.
+    """
+    pos = start
+    end = len(data)
+    while pos < end:
+        try:
+            decoded = _b64decode(data[pos : pos + _BASE64_DECODE_CHUNK_CHARS], validate=True)
+        except binascii.Error:
+            yield _b64decode(data[pos:])
+            return
+        yield decoded
+        pos += _BASE64_DECODE_CHUNK_CHARS
+
+
+# Image files are small and many; a few threads overlap their file
+# create/write/rename syscalls. Kept low because this already runs beside
+# the markdown writer for each of MAX_CONCURRENT_FILES documents.
+_IMAGE_SAVE_MAX_WORKERS = 4
+
+
+def _existing_image_matches(image_path: Path, image_base64: str, start: int) -> bool:
+    """True if *image_path* already holds exactly this payload's decoded bytes."""
+    try:
+        size = image_path.stat().st_size
+    except OSError:
+        return False
+    encoded_len = len(image_base64) - start
+    padding = image_base64.count("=", max(start, len(image_base64) - 2))
+    if encoded_len % 4 or size != encoded_len // 4 * 3 - padding:
+        return False
+    try:
+        with open(image_path, "rb") as f:
+            for chunk in _iter_base64_decoded(image_base64, start):
+                if f.read(len(chunk)) != chunk:
+                    return False
+            return f.read(1) == b""
+    except (binascii.Error, OSError):
+        return False
+
+
+def _write_extracted_image(image_path: Path, image_base64: str) -> bool:
+    """Decode one base64 image (data URI or bare) into *image_path*; False on failure."""
+    try:
+        # Skip a data URI prefix by offset rather than slicing a copy
+        start = image_base64.index(",") + 1 if image_base64.startswith("data:") else 0
+
+        # Re-runs on the same document produce the same images; skip rewriting them
+        if _existing_image_matches(image_path, image_base64, start):
+            logger.debug("Extracted image already up to date: %s", image_path.name)
+            return True
+
+        # Decode in bounded chunks straight into the output file
+        utils.atomic_write_chunks(image_path, _iter_base64_decoded(image_base64, start))
+        logger.debug("Saved extracted image: %s", image_path.name)
+        return True
+    except (ValueError, OSError) as e:
+        # Malformed payloads (binascii.Error is a ValueError) and write
+        # failures skip this image; anything else is a bug and propagates.
+        logger.error("Error saving image: %s", e)
+        return False
+
+
+def save_extracted_images(ocr_result: Dict[str, Any], file_path: Path, output_stem: Optional[str] = None) -> List[Path]:
     """
     Save extracted images from OCR result.
 
+    Images are decoded and written concurrently; numbering stays sequential
+    over the images that were saved.
+
     Args:
         ocr_result: OCR result dictionary
         file_path: Original file path
+        output_stem: Pre-computed ``utils.safe_output_stem(file_path)`` (optional)
 
     Returns:
         List of saved image paths
     """
-    saved_images = []
+    saved_images: List[Path] = []
 
     if not config.MISTRAL_INCLUDE_IMAGES:
         return saved_images
 
-    stem = utils.safe_output_stem(file_path)
-    image_dir = config.OUTPUT_IMAGES_DIR / f"{stem}_ocr"
-    image_count = 0
-
-    for page in ocr_result.get("pages", []):
-        page_num = page.get("page_number", 1)
-
-        for img in page.get("images", []):
-            image_base64 = img.get("base64")
-
-            if not image_base64:
-                continue
-
-            # Create output directory on first actual image (avoids empty folders)
-            image_dir.mkdir(parents=True, exist_ok=True)
-
-            try:
-                if image_base64.startswith("data:"):
-                    image_base64 = image_base64.split(",", 1)[1]
-
-                # Decode base64 image
-                image_data = base64.b64decode(image_base64)
+    jobs = [
+        (page.get("page_number", 1), img["base64"])
+        for page in ocr_result.get("pages", [])
+        for img in page.get("images", [])
+        if img.get("base64")
+    ]
+    if not jobs:
+        return saved_images
 
-                image_count += 1
-                image_path = image_dir / f"page_{page_num}_image_{image_count}.png"
+    stem = output_stem or utils.safe_output_stem(file_path)
+    image_dir = config.OUTPUT_IMAGES_DIR / f"{stem}_ocr"
+    # Created only when there is an image to save (avoids empty folders)
+    image_dir.mkdir(parents=True, exist_ok=True)
 
-                utils.atomic_write_binary(image_path, image_data)
+    paths = [image_dir / f"page_{page_num}_image_{i}.png" for i, (page_num, _) in enumerate(jobs, 1)]
 
-                saved_images.append(image_path)
-                logger.debug("Saved extracted image: %s", image_path.name)
+    max_workers = min(len(jobs), _IMAGE_SAVE_MAX_WORKERS)
+    if max_workers <= 1:
+        results = [_write_extracted_image(path, data) for path, (_, data) in zip(paths, jobs)]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_write_extracted_image, paths, [data for _, data in jobs]))
 
-            except Exception as e:
-                logger.error("Error saving image: %s", e)
+    for index, ((page_num, _), path, ok) in enumerate(zip(jobs, paths, results), 1):
+        if not ok:
+            continue
+        # Close numbering gaps left by images that failed to decode (rare);
+        # the common gap-free case keeps the path built above.
+        if len(saved_images) + 1 != index:
+            final_path = image_dir / f"page_{page_num}_image_{len(saved_images) + 1}.png"
+            path.replace(final_path)
+            path = final_path
+        saved_images.append(path)
 
     if saved_images:
         logger.info("Saved %s extracted images to %s", len(saved_images), image_dir)
@@ -1751,6 +2269,7 @@ def _process_ocr_result_pipeline(
     use_cache: bool = True,
     improve_weak: bool = True,
     from_cache: bool = False,
+    cache_contract: Optional[Dict[str, Any]] = None,
 ) -> Tuple[bool, Optional[Path], Optional[str]]:
     """
     Common pipeline for processing OCR results (quality check, improvement, saving).
@@ -1762,12 +2281,17 @@ def _process_ocr_result_pipeline(
         use_cache: Whether to cache the result
         improve_weak: Whether to improve weak pages
         from_cache: Whether this result came from cache (skips re-improvement and image saving)
+        cache_contract: Contract metadata already built for the cache lookup (built here if omitted)
 
     Returns:
         Tuple of (success, output_md_path, error_message)
     """
     quality_assessment: Optional[Dict[str, Any]] = None
 
+    # ``safe_output_stem`` resolves the path and globs INPUT_DIR; compute it once
+    # for every output written below instead of once per file.
+    output_stem = utils.safe_output_stem(file_path)
+
     # If from cache, reuse stored quality assessment if available
     if from_cache and "quality_assessment" in ocr_result:
         logger.info("Using cached OCR result with stored quality assessment")
@@ -1798,10 +2322,17 @@ def _process_ocr_result_pipeline(
         )
         model = config.get_ocr_model()
         # Note: improve_weak_pages is synchronous
-        ocr_result = improve_weak_pages(client, file_path, ocr_result, model)
+        ocr_result = improve_weak_pages(
+            client,
+            file_path,
+            ocr_result,
+            model,
+            weak_pages=quality_assessment.get("weak_page_indices"),
+            use_cache=use_cache,
+        )
 
-        # Re-assess quality after improvement
-        quality_assessment = assess_ocr_quality(ocr_result)
+        # Re-assess quality after improvement; only the weak pages were replaced
+        quality_assessment = assess_ocr_quality(ocr_result, recheck_pages=quality_assessment.get("weak_page_indices"))
         ocr_result["quality_assessment"] = quality_assessment
         logger.info("Quality after improvement: %.1f/100", quality_assessment["quality_score"])
 
@@ -1811,36 +2342,53 @@ def _process_ocr_result_pipeline(
             file_path,
             ocr_result,
             cache_type="mistral_ocr",
-            metadata=build_mistral_ocr_cache_contract_metadata(
-                improve_weak=improve_weak,
-            ),
+            metadata=cache_contract or build_mistral_ocr_cache_contract_metadata(improve_weak=improve_weak),
         )
 
-    # Save extracted images (skip for cached results to avoid redundant IO)
-    if not from_cache:
-        save_extracted_images(ocr_result, file_path)
-    else:
+    # Save extracted images (skip for cached results to avoid redundant IO).
+    # The markdown only references images by path, so decode and write them on
+    # a worker thread while the markdown / JSON outputs are generated.
+    if from_cache:
         logger.debug("Skipping image extraction for cached result")
+        return True, _write_ocr_outputs(file_path, ocr_result, output_stem), None
 
+    with ThreadPoolExecutor(max_workers=1) as image_pool:
+        image_future = image_pool.submit(save_extracted_images, ocr_result, file_path, output_stem=output_stem)
+        output_path = _write_ocr_outputs(file_path, ocr_result, output_stem)
+
+    try:
+        image_future.result()
+    except Exception as e:
+        logger.warning("Failed to save extracted images: %s", e)
+
+    return True, output_path, None
+
+
+def _write_ocr_outputs(file_path: Path, ocr_result: Dict[str, Any], output_stem: str) -> Path:
+    """Write the markdown, optional OCR JSON and structured outputs; return the markdown path."""
     # Generate markdown output
-    output_path = _create_markdown_output(file_path, ocr_result)
+    output_path = _create_markdown_output(file_path, ocr_result, output_stem=output_stem)
+    saved = [output_path]
 
     # Save JSON metadata if requested (non-fatal -- OCR already succeeded)
     if config.SAVE_MISTRAL_JSON:
         try:
-            json_path = config.OUTPUT_MD_DIR / f"{utils.safe_output_stem(file_path)}_ocr_metadata.json"
-            utils.atomic_write_text(json_path, json.dumps(ocr_result, indent=2, ensure_ascii=False))
-            logger.info("Saved OCR metadata: %s", json_path.name)
+            json_path = config.OUTPUT_MD_DIR / f"{output_stem}_ocr_metadata.json"
+            utils.atomic_write_binary(json_path, utils.json_dumps_bytes(ocr_result))
+            saved.append(json_path)
         except Exception as e:
             logger.warning("Failed to save OCR metadata JSON: %s", e)
 
     # Save structured outputs if they exist (non-fatal -- OCR already succeeded)
     try:
-        _save_structured_outputs(file_path, ocr_result)
+        saved.extend(_save_structured_outputs(file_path, ocr_result, output_stem=output_stem))
     except Exception as e:
         logger.warning("Failed to save structured outputs: %s", e)
 
-    return True, output_path, None
+    # One summary line instead of a log record per output file
+    logger.info("Saved Mistral OCR outputs: %s", ", ".join(p.name for p in saved))
+
+    return output_path
 
 
 # ============================================================================
@@ -1870,8 +2418,10 @@ def convert_with_mistral_ocr(
 
     # Check cache (payload must match current OCR request contract metadata)
     from_cache = False
+    contract: Optional[Dict[str, Any]] = None
     if use_cache:
         cache_entry = utils.cache.get_entry(file_path, cache_type="mistral_ocr")
+        # Built once per document: the same contract is stored with the fresh result below
         contract = build_mistral_ocr_cache_contract_metadata(
             improve_weak=improve_weak,
         )
@@ -1889,65 +2439,96 @@ def convert_with_mistral_ocr(
                     file_path.name,
                     type(cached_result).__name__,
                 )
-                success, ocr_result, error = process_with_ocr(client, file_path)
+                success, ocr_result, error = _ocr_document(client, file_path)
         else:
             if cache_entry and not mistral_ocr_cache_contract_matches(cache_entry.get("metadata"), contract):
                 logger.debug(
                     "Mistral OCR cache ignored for %s (contract metadata mismatch)",
                     file_path.name,
                 )
-            success, ocr_result, error = process_with_ocr(client, file_path)
+            success, ocr_result, error = _ocr_document(client, file_path)
     else:
-        success, ocr_result, error = process_with_ocr(client, file_path)
+        success, ocr_result, error = _ocr_document(client, file_path)
 
     if not success or not ocr_result:
         return False, None, error
 
     # Process result using common pipeline
     # Pass from_cache flag to skip redundant API calls and IO for cached results
-    return _process_ocr_result_pipeline(client, file_path, ocr_result, use_cache, improve_weak, from_cache)
+    return _process_ocr_result_pipeline(
+        client, file_path, ocr_result, use_cache, improve_weak, from_cache, cache_contract=contract
+    )
 
 
-def _save_structured_outputs(file_path: Path, ocr_result: Dict[str, Any]) -> None:
+def _save_structured_outputs(
+    file_path: Path, ocr_result: Dict[str, Any], output_stem: Optional[str] = None
+) -> List[Path]:
     """
     Save structured outputs from bbox and document annotations.
 
     Args:
         file_path: Original file path
         ocr_result: OCR result dictionary containing structured outputs
+        output_stem: Pre-computed ``utils.safe_output_stem(file_path)`` (optional)
+
+    Returns:
+        Paths of the files written (empty if there were no annotations)
     """
+    saved: List[Path] = []
+    has_bbox = bool(ocr_result.get("bbox_annotations"))
+    has_doc = bool(ocr_result.get("document_annotation"))
+    if not (has_bbox or has_doc):
+        return saved
+    stem = output_stem or utils.safe_output_stem(file_path)
+
     # Save bounding box annotations if present
-    if "bbox_annotations" in ocr_result and ocr_result["bbox_annotations"]:
-        bbox_path = config.OUTPUT_MD_DIR / f"{utils.safe_output_stem(file_path)}_bbox_annotations.json"
-        utils.atomic_write_text(
-            bbox_path,
-            json.dumps(ocr_result["bbox_annotations"], indent=2, ensure_ascii=False),
-        )
-        logger.info("Saved bbox annotations: %s", bbox_path.name)
+    if has_bbox:
+        bbox_path = config.OUTPUT_MD_DIR / f"{stem}_bbox_annotations.json"
+        utils.atomic_write_binary(bbox_path, utils.json_dumps_bytes(ocr_result["bbox_annotations"]))
+        saved.append(bbox_path)
 
     # Save document annotations if present
-    if "document_annotation" in ocr_result and ocr_result["document_annotation"]:
-        doc_path = config.OUTPUT_MD_DIR / f"{utils.safe_output_stem(file_path)}_document_annotation.json"
-        utils.atomic_write_text(
-            doc_path,
-            json.dumps(ocr_result["document_annotation"], indent=2, ensure_ascii=False),
-        )
-        logger.info("Saved document annotation: %s", doc_path.name)
+    if has_doc:
+        doc_path = config.OUTPUT_MD_DIR / f"{stem}_document_annotation.json"
+        utils.atomic_write_binary(doc_path, utils.json_dumps_bytes(ocr_result["document_annotation"]))
+        saved.append(doc_path)
 
+    return saved
 
-def _create_markdown_output(file_path: Path, ocr_result: Dict[str, Any]) -> Path:
+
+def _page_margin_text(value: Any) -> str:
+    """Return the stripped text of a page header/footer (str or object with ``.text``)."""
+    if not value:
+        return ""
+    text = value if isinstance(value, str) else getattr(value, "text", str(value))
+    return text.strip()
+
+
+def _format_markdown_page(page: Dict[str, Any]) -> str:
+    """Render one page block (heading, optional header/footer, text, separator) for the markdown output."""
+    header = _page_margin_text(page.get("header"))
+    footer = _page_margin_text(page.get("footer"))
+    header_md = f"> **Header:** {header}\n\n" if header else ""
+    footer_md = f"\n\n> **Footer:** {footer}" if footer else ""
+    return f"### Page {page.get('page_number', 1)}\n\n{header_md}{page.get('text', '')}{footer_md}\n\n---\n\n"
+
+
+def _create_markdown_output(file_path: Path, ocr_result: Dict[str, Any], output_stem: Optional[str] = None) -> Path:
     """
     Create markdown output from OCR result.
 
     Args:
         file_path: Original file path
         ocr_result: OCR result dictionary
+        output_stem: Pre-computed ``utils.safe_output_stem(file_path)`` (optional)
 
     Returns:
         Path to created markdown file
     """
+    pages = ocr_result.get("pages") or []
+    total_pages = len(pages)
     # Calculate total image count from all pages (images are stored per-page)
-    total_image_count = sum(len(page.get("images", [])) for page in ocr_result.get("pages", []))
+    total_image_count = sum(len(page.get("images") or ()) for page in pages)
 
     # Generate frontmatter
     frontmatter = utils.generate_yaml_frontmatter(
@@ -1955,57 +2536,43 @@ def _create_markdown_output(file_path: Path, ocr_result: Dict[str, Any]) -> Path
         file_name=file_path.name,
         conversion_method="Mistral OCR",
         additional_fields={
-            "page_count": len(ocr_result.get("pages", [])),
+            "page_count": total_pages,
             "image_count": total_image_count,
         },
     )
 
-    # Build markdown content
-    md_content = frontmatter + f"\n# OCR Result: {file_path.name}\n\n"
-
-    # Add page-by-page breakdown (no "Full Text" section to avoid duplication)
-    if ocr_result.get("pages"):
-        total_pages = len(ocr_result["pages"])
-        md_content += f"## OCR Content ({total_pages} page{'s' if total_pages != 1 else ''})\n\n"
-
+    # Build markdown content as a sequence of pieces (page blocks are rendered whole)
+    if pages:
         # page_number is now preserved as the API's 1-based index
-        for page in ocr_result["pages"]:
-            text = page.get("text", "")
-            display_page_num = page.get("page_number", 1)
-
-            md_content += f"### Page {display_page_num}\n\n"
-
-            # Header (if extracted separately from page content)
-            header = page.get("header")
-            if header:
-                header_text = header if isinstance(header, str) else getattr(header, "text", str(header))
-                if header_text.strip():
-                    md_content += f"> **Header:** {header_text.strip()}\n\n"
-
-            md_content += text
-
-            # Footer (if extracted separately from page content)
-            footer = page.get("footer")
-            if footer:
-                footer_text = footer if isinstance(footer, str) else getattr(footer, "text", str(footer))
-                if footer_text.strip():
-                    md_content += f"\n\n> **Footer:** {footer_text.strip()}"
-
-            md_content += "\n\n---\n\n"
+        md_pieces = itertools.chain(
+            (
+                frontmatter,
+                f"\n# OCR Result: {file_path.name}\n\n",
+                f"## OCR Content ({total_pages} page{'s' if total_pages != 1 else ''})\n\n",
+            ),
+            map(_format_markdown_page, pages),
+        )
     else:
         # Fallback if pages aren't available (shouldn't happen, but be defensive)
-        md_content += "## OCR Content\n\n"
-        md_content += ocr_result.get("full_text", "")
-        md_content += "\n\n---\n\n"
+        md_pieces = iter(
+            (
+                f"{frontmatter}\n# OCR Result: {file_path.name}\n\n",
+                f"## OCR Content\n\n{ocr_result.get('full_text', '')}\n\n---\n\n",
+            )
+        )
 
-    # Save markdown
-    output_path = config.OUTPUT_MD_DIR / f"{utils.safe_output_stem(file_path)}_mistral_ocr.md"
-    utils.atomic_write_text(output_path, md_content)
+    output_path = config.OUTPUT_MD_DIR / f"{output_stem or utils.safe_output_stem(file_path)}_mistral_ocr.md"
 
-    # Save text version
-    utils.save_text_output(output_path, md_content)
+    if not config.GENERATE_TXT_OUTPUT:
+        # Nothing else needs the whole document: stream page blocks to the file
+        # so only one rendered page is held at a time.
+        utils.atomic_write_text(output_path, md_pieces)
+        return output_path
 
-    logger.info("Saved Mistral OCR output: %s", output_path.name)
+    # The text version is derived from the full markdown, so join once
+    md_content = "".join(md_pieces)
+    utils.atomic_write_text(output_path, md_content)
+    utils.save_text_output(output_path, md_content)
 
     return output_path
 
@@ -2038,11 +2605,13 @@ def _build_qna_messages(document_url: str, question: str) -> List[Dict[str, Any]
     ]
 
 
+@functools.lru_cache(maxsize=1)
 def _get_mistralai_package_version() -> Optional[str]:
+    # importlib.metadata scans sys.path on every lookup; the installed SDK
+    # cannot change mid-process, so resolve it once (it is read on every
+    # cache lookup and cache write).
     try:
-        from importlib.metadata import version
-
-        return version("mistralai")
+        return _pkg_version("mistralai")
     except Exception:
         return None
 
@@ -2070,6 +2639,8 @@ def build_mistral_ocr_cache_contract_metadata(
         "extract_footer": bool(config.MISTRAL_EXTRACT_FOOTER),
         "image_limit": config.MISTRAL_IMAGE_LIMIT,
         "image_min_size": config.MISTRAL_IMAGE_MIN_SIZE,
+        # Page-range chunking changes which pages a document annotation sees
+        "ocr_chunk_pages": config.MISTRAL_OCR_CHUNK_PAGES,
         "structured_output_enabled": bool(config.MISTRAL_ENABLE_STRUCTURED_OUTPUT),
         "bbox_annotation_enabled": bool(
             config.MISTRAL_ENABLE_STRUCTURED_OUTPUT and config.MISTRAL_ENABLE_BBOX_ANNOTATION
@@ -2087,6 +2658,27 @@ def build_mistral_ocr_cache_contract_metadata(
     }
 
 
+# Contract fields that affect a single-page re-OCR request (model is part of the page key)
+_WEAK_PAGE_CONTRACT_KEYS = (
+    "contract_type",
+    "contract_version",
+    "sdk_version",
+    "table_format",
+    "extract_header",
+    "extract_footer",
+    "bbox_annotation_enabled",
+    "document_annotation_enabled",
+    "document_schema_type",
+    "document_annotation_prompt_hash",
+)
+
+
+def _weak_page_cache_contract() -> Dict[str, Any]:
+    """Metadata stored with ``mistral_ocr_pages`` entries; must match on read for a hit."""
+    contract = build_mistral_ocr_cache_contract_metadata()
+    return {key: contract[key] for key in _WEAK_PAGE_CONTRACT_KEYS}
+
+
 def mistral_ocr_cache_contract_matches(stored: Any, current: Dict[str, Any]) -> bool:
     if not isinstance(stored, dict):
         return False
@@ -2165,6 +2757,21 @@ def _resolve_and_validate_dns(hostname: str) -> Tuple[bool, Optional[str]]:
     return True, None
 
 
+# Hostnames rejected before any DNS lookup (loopback and cloud metadata endpoints)
+_BLOCKED_DOCUMENT_HOSTS = frozenset(
+    {
+        "localhost",
+        "127.0.0.1",
+        "0.0.0.0",
+        "::1",
+        "[::1]",
+        "metadata.google.internal",
+        "169.254.169.254",
+        "metadata.google.internal.",
+    }
+)
+
+
 def _validate_document_url(url: str) -> Tuple[bool, Optional[str]]:
     """
     Validate a document URL to prevent SSRF attacks.
@@ -2193,17 +2800,7 @@ def _validate_document_url(url: str) -> Tuple[bool, Optional[str]]:
     if not hostname:
         return False, "URL must include a hostname"
 
-    blocked_hosts = {
-        "localhost",
-        "127.0.0.1",
-        "0.0.0.0",
-        "::1",
-        "[::1]",
-        "metadata.google.internal",
-        "169.254.169.254",
-        "metadata.google.internal.",
-    }
-    if hostname in blocked_hosts:
+    if hostname in _BLOCKED_DOCUMENT_HOSTS:
         return False, f"URLs pointing to internal hosts are not allowed: {hostname}"
 
     ok, err = _validate_ip_str(hostname.strip("[]"), hostname)
@@ -2458,8 +3055,8 @@ def _prepare_batch_entries(
             include_retries=False,
             pages=None,
             request_id=custom_id,
+            include_image_base64=include_image_base64,
         )
-        body["include_image_base64"] = include_image_base64
 
         entry = {"custom_id": custom_id, "body": body}
         entries.append(entry)
@@ -2529,8 +3126,11 @@ def create_batch_ocr_file(
         # Write JSONL (signed URLs). Prefer writing under ``config.CACHE_DIR`` (POSIX
         # 0o700 from ``ensure_directories``). On Windows, tighten ACLs on ``cache/``
         # or the output path if these URLs must stay secret on disk.
-        content = "".join(json.dumps(entry) + "\n" for entry in entries)
-        utils.atomic_write_text(output_file, content)
+        # Entries are serialised straight to bytes and streamed, so the
+        # payload is never built as one str and then re-encoded.
+        utils.atomic_write_chunks(
+            output_file, (utils.json_dumps_bytes(entry, indent=False) + b"\n" for entry in entries)
+        )
 
         if sys.platform != "win32":
             os.chmod(output_file, 0o600)
@@ -2703,6 +3303,9 @@ def get_batch_job_status(
         return False, None, error_msg
 
 
+_BATCH_DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+
+
 def download_batch_results(
     job_id: str,
     output_dir: Optional[Path] = None,
@@ -2744,20 +3347,22 @@ def download_batch_results(
         # - current SDK returns an httpx.Response stream wrapper
         file_content = client.files.download(file_id=job.output_file)
 
+        # Results embed per-page base64 images, so stream them to disk in
+        # chunks where the payload allows it instead of buffering it whole.
         if httpx is not None and isinstance(file_content, httpx.Response):
-            payload = file_content.read()
-            file_content.close()
+            try:
+                utils.atomic_write_chunks(output_path, file_content.iter_bytes(_BATCH_DOWNLOAD_CHUNK_BYTES))
+            finally:
+                file_content.close()
         elif isinstance(file_content, (bytes, bytearray, memoryview)):
-            payload = bytes(file_content)
+            utils.atomic_write_binary(output_path, file_content)
         elif hasattr(file_content, "content"):
-            payload = file_content.content
+            utils.atomic_write_binary(output_path, file_content.content)
         elif hasattr(file_content, "read"):
-            payload = file_content.read()
+            utils.atomic_write_chunks(output_path, iter(lambda: file_content.read(_BATCH_DOWNLOAD_CHUNK_BYTES), b""))
         else:
             raise TypeError(f"Unsupported batch download payload type: {type(file_content)!r}")
 
-        utils.atomic_write_binary(output_path, payload)
-
         logger.info("Batch results saved to: %s", output_path)
         return True, output_path, None
 
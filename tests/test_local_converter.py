@@ -20,6 +20,7 @@ Tests cover:
 
 import io
 import sys
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -82,6 +83,13 @@ class TestFixMergedCurrencyCells:
         result = local_converter._fix_merged_currency_cells(table)
         assert len(result[0]) == 2
 
+    def test_identical_merged_cells_split_in_every_row(self):
+        table = [["A", "$ 0.00 $ 0.00"], ["B", "$ 0.00 $ 0.00"], ["C", "$ 0.00"]]
+        result = local_converter._fix_merged_currency_cells(table)
+        assert result == [["A", "$0.00", "$0.00"], ["B", "$0.00", "$0.00"], ["C", "$ 0.00"]]
+        # Input rows are left untouched
+        assert table[0] == ["A", "$ 0.00 $ 0.00"]
+
 
 # ============================================================================
 # _fix_split_headers Tests
@@ -556,6 +564,32 @@ class TestSaveTablesToFiles:
         md_files = list(tmp_path.glob("*.md"))
         assert len(md_files) > 0
 
+    @pytest.mark.parametrize("txt_output", [False, True])
+    def test_markdown_streamed_or_joined_matches(self, tmp_path, monkeypatch, txt_output):
+        monkeypatch.setattr(config, "OUTPUT_MD_DIR", tmp_path / "md")
+        monkeypatch.setattr(config, "OUTPUT_TXT_DIR", tmp_path / "txt")
+        monkeypatch.setattr(config, "TABLE_OUTPUT_FORMATS", ["markdown"])
+        monkeypatch.setattr(config, "GENERATE_TXT_OUTPUT", txt_output)
+        (tmp_path / "md").mkdir()
+        (tmp_path / "txt").mkdir()
+        written = []
+        original_write = local_converter.utils.atomic_write_text
+
+        def recording_write(path, content, *args, **kwargs):
+            written.append(content)
+            return original_write(path, content, *args, **kwargs)
+
+        monkeypatch.setattr(local_converter.utils, "atomic_write_text", recording_write)
+        tables = [[["Name", "Value"], ["A", "1"]], [["Col"], ["x"]]]
+
+        (md_path,) = local_converter.save_tables_to_files(tmp_path / "report.pdf", tables)
+
+        content = md_path.read_text(encoding="utf-8")
+        assert "## Table 1\n\n| Name | Value |" in content
+        assert content.endswith("## Table 2\n\n| Col |\n| --- |\n| x |\n\n---\n\n")
+        assert isinstance(written[0], str) is txt_output
+        assert (tmp_path / "txt" / f"{md_path.stem}.txt").exists() is txt_output
+
     def test_empty_tables_returns_empty(self, tmp_path, monkeypatch):
         monkeypatch.setattr(config, "OUTPUT_MD_DIR", tmp_path)
         monkeypatch.setattr(config, "INPUT_DIR", tmp_path)
@@ -602,6 +636,47 @@ class TestConvertPdfToImages:
         assert success is True
         assert len(paths) == 2
 
+    def test_pages_encoded_on_thread_pool_in_order(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "OUTPUT_IMAGES_DIR", tmp_path)
+        monkeypatch.setattr(config, "PDF_IMAGE_FORMAT", "png")
+        monkeypatch.setattr(config, "POPPLER_PATH", "")
+        monkeypatch.setattr(config, "PDF_IMAGE_USE_PDFTOCAIRO", False)
+
+        pdf_file = tmp_path / "test.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4")
+        images = [MagicMock() for _ in range(5)]
+
+        with patch.object(local_converter, "convert_from_path", return_value=images):
+            success, paths, error = local_converter.convert_pdf_to_images(pdf_file, thread_count=3)
+
+        assert success is True
+        assert [p.name for p in paths] == [f"page_{i:03d}.png" for i in range(1, 6)]
+        for image, path in zip(images, paths):
+            image.save.assert_called_once_with(str(path), "PNG", optimize=True)
+            image.close.assert_called_once()
+
+    def test_poppler_scratch_files_are_not_left_behind(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "OUTPUT_IMAGES_DIR", tmp_path)
+        monkeypatch.setattr(config, "PDF_IMAGE_FORMAT", "png")
+        monkeypatch.setattr(config, "POPPLER_PATH", "")
+        monkeypatch.setattr(config, "PDF_IMAGE_USE_PDFTOCAIRO", False)
+
+        pdf_file = tmp_path / "test.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4")
+        out_dir = tmp_path / "pages"
+
+        def _fake_convert(**kwargs):
+            # pdf2image writes uuid-named page files into output_folder
+            (Path(kwargs["output_folder"]) / "0f3a-1.png").write_bytes(b"raw")
+            return [MagicMock()]
+
+        with patch.object(local_converter, "convert_from_path", side_effect=_fake_convert):
+            success, paths, error = local_converter.convert_pdf_to_images(pdf_file, output_dir=out_dir)
+
+        assert success is True
+        assert paths == [out_dir / "page_001.png"]
+        assert list(out_dir.iterdir()) == []  # mocked save wrote nothing; scratch dir removed
+
     def test_handles_conversion_error(self, tmp_path, monkeypatch):
         monkeypatch.setattr(config, "OUTPUT_IMAGES_DIR", tmp_path)
         monkeypatch.setattr(config, "PDF_IMAGE_DPI", 200)
@@ -667,15 +742,17 @@ class TestImportFallbacks:
     """Lines 42-62: Import fallback branches when optional deps are missing."""
 
     def test_markitdown_import_failure(self):
-        """Lines 42-47: MarkItDown import failure sets all to None."""
+        """MarkItDown import failure (on first use) sets all its names to None."""
         import importlib
 
         original_markitdown = sys.modules.get("markitdown")
         try:
             sys.modules["markitdown"] = None
             importlib.reload(local_converter)
-            # After reload with failed import, MarkItDown should be None
+            local_converter._import_markitdown()
+            # After the failed import, every MarkItDown name should be None
             assert local_converter.MarkItDown is None
+            assert local_converter.FileConversionException is None
         finally:
             if original_markitdown is not None:
                 sys.modules["markitdown"] = original_markitdown
@@ -683,6 +760,22 @@ class TestImportFallbacks:
                 sys.modules.pop("markitdown", None)
             importlib.reload(local_converter)
 
+    def test_markitdown_not_imported_until_first_use(self):
+        import importlib
+
+        original_markitdown = sys.modules.pop("markitdown", None)
+        try:
+            importlib.reload(local_converter)
+            assert local_converter.MarkItDown is local_converter._MARKITDOWN_NOT_IMPORTED
+            assert "markitdown" not in sys.modules
+
+            local_converter._import_markitdown()
+            assert local_converter.MarkItDown is not local_converter._MARKITDOWN_NOT_IMPORTED
+        finally:
+            if original_markitdown is not None:
+                sys.modules["markitdown"] = original_markitdown
+            importlib.reload(local_converter)
+
     def test_pdfplumber_import_failure(self):
         """Lines 51-52: pdfplumber import failure."""
         import importlib
@@ -1085,6 +1178,45 @@ class TestSaveTablesToCsv:
         csv_files = list(tmp_path.glob("*.csv"))
         assert len(csv_files) == 1
 
+    def test_csv_tables_do_not_share_rows(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "OUTPUT_MD_DIR", tmp_path)
+        monkeypatch.setattr(config, "INCLUDE_METADATA", False)
+        monkeypatch.setattr(config, "INPUT_DIR", tmp_path)
+        monkeypatch.setattr(config, "GENERATE_TXT_OUTPUT", False)
+        monkeypatch.setattr(config, "TABLE_OUTPUT_FORMATS", ["csv"])
+
+        pdf_file = tmp_path / "report.pdf"
+        pdf_file.touch()
+
+        tables = [
+            [["Name", "Value"], ["Alpha", "1"], ["Beta", "2"]],
+            [["Item", "Qty"], ["Gamma", "3"]],
+        ]
+        local_converter.save_tables_to_files(pdf_file, tables)
+
+        second = sorted(tmp_path.glob("*.csv"))[1].read_text(encoding="utf-8")
+        assert "Gamma" in second
+        assert "Alpha" not in second and "Beta" not in second
+
+    def test_tables_normalized_once_for_all_formats(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "OUTPUT_MD_DIR", tmp_path)
+        monkeypatch.setattr(config, "INCLUDE_METADATA", False)
+        monkeypatch.setattr(config, "INPUT_DIR", tmp_path)
+        monkeypatch.setattr(config, "GENERATE_TXT_OUTPUT", False)
+        monkeypatch.setattr(config, "TABLE_OUTPUT_FORMATS", ["markdown", "csv"])
+
+        pdf_file = tmp_path / "report.pdf"
+        pdf_file.touch()
+        tables = [[["Name", "Value"], ["Alpha", "1"]], [["Item", "Qty"], ["Gamma", "3"]]]
+
+        with patch.object(
+            local_converter.utils, "normalize_table_headers", wraps=local_converter.utils.normalize_table_headers
+        ) as spy:
+            created = local_converter.save_tables_to_files(pdf_file, tables)
+
+        assert spy.call_count == len(tables)
+        assert len(created) == 3
+
     def test_csv_write_exception(self, tmp_path, monkeypatch):
         """Line 601: exception during CSV write."""
         monkeypatch.setattr(config, "OUTPUT_MD_DIR", tmp_path)
@@ -1215,6 +1347,66 @@ class TestAnalyzeFileContentPdf:
         assert result["has_tables"] is True
         assert result["has_images"] is True
         assert result["is_text_based"] is True
+        # Table detection is not repeated once a table has been found
+        assert mock_page.extract_tables.call_count == 1
+        # Two text pages settle the 3-page majority vote; the third is not extracted
+        assert mock_page.extract_text.call_count == 2
+
+    def test_unchanged_pdf_analyzed_once(self, tmp_path):
+        pdf_file = tmp_path / "memo.pdf"
+        pdf_file.write_text("x" * 100)
+
+        mock_page = MagicMock()
+        mock_page.extract_text.return_value = "This is a long text content " * 10
+        mock_page.extract_tables.return_value = []
+        mock_page.images = []
+        mock_pdf = MagicMock()
+        mock_pdf.pages = [mock_page]
+        mock_pdf.__enter__ = MagicMock(return_value=mock_pdf)
+        mock_pdf.__exit__ = MagicMock(return_value=False)
+
+        with patch.object(local_converter, "pdfplumber") as mock_plumber:
+            mock_plumber.open.return_value = mock_pdf
+            first = local_converter.analyze_file_content(pdf_file)
+            first["page_count"] = 99  # callers get their own copy
+            second = local_converter.analyze_file_content(pdf_file)
+            assert mock_plumber.open.call_count == 1
+            assert second["page_count"] == 1
+
+            # A changed file is analyzed again
+            pdf_file.write_text("y" * 200)
+            local_converter.analyze_file_content(pdf_file)
+            assert mock_plumber.open.call_count == 2
+
+    @pytest.mark.parametrize(
+        "texts, extracted, text_based",
+        [
+            (["", "", "x" * 60], 2, False),
+            (["x" * 60, "", "x" * 60], 3, True),
+            (["", "x" * 60, "x" * 60], 3, True),
+        ],
+    )
+    def test_text_vote_stops_once_decided(self, tmp_path, texts, extracted, text_based):
+        pdf_file = tmp_path / "vote.pdf"
+        pdf_file.write_text("x" * 100)
+        pages = []
+        for text in texts:
+            page = MagicMock()
+            page.extract_text.return_value = text
+            page.extract_tables.return_value = []
+            page.images = []
+            pages.append(page)
+        mock_pdf = MagicMock()
+        mock_pdf.pages = pages
+        mock_pdf.__enter__ = MagicMock(return_value=mock_pdf)
+        mock_pdf.__exit__ = MagicMock(return_value=False)
+
+        with patch.object(local_converter, "pdfplumber") as mock_plumber:
+            mock_plumber.open.return_value = mock_pdf
+            result = local_converter.analyze_file_content(pdf_file)
+
+        assert sum(page.extract_text.call_count for page in pages) == extracted
+        assert result["is_text_based"] is text_based
 
     def test_pdf_text_less(self, tmp_path):
         """PDF with no extractable text."""
@@ -180,6 +180,18 @@ class TestIsWeakPage:
         text = " ".join(["repeated"] * 200) + " 12345678901234567890"
         assert mistral_converter._is_weak_page(text) is True
 
+    @pytest.mark.parametrize("n_unique", [60, 89, 90, 91, 100])
+    def test_uniqueness_boundary_matches_full_ratio(self, monkeypatch, n_unique):
+        monkeypatch.setattr(config, "OCR_MIN_UNIQUENESS_RATIO", 0.3)
+        monkeypatch.setattr(config, "OCR_MIN_TEXT_LENGTH", 0)
+        monkeypatch.setattr(config, "OCR_MAX_PHRASE_REPETITIONS", 1000)
+        monkeypatch.setattr(config, "OCR_MIN_AVG_LINE_LENGTH", 0)
+        # 300 tokens with ratios straddling the 0.3 threshold
+        tokens = [f"word{i}" for i in range(n_unique)] + ["word0"] * (100 - n_unique)
+        tokens = (tokens * 3)[:300]
+        expected = len(set(tokens)) / len(tokens) < 0.3
+        assert mistral_converter._is_weak_page(" ".join(tokens)) is expected
+
     def test_no_digits_is_weak(self):
         # Long text without enough digits
         text = "This is a page of text without any numbers in it. " * 5
@@ -200,6 +212,14 @@ class TestAssessOcrQuality:
         assert assessment["is_usable"] is False
         assert assessment["quality_score"] == 0.0
 
+    @pytest.mark.parametrize("text", ["", " \n\t ", "x", "  a b  ", "\n\n page\u2003text \u3000\x1c\n\n", "é\u00a0"])
+    def test_stripped_length_matches_strip(self, text):
+        assert mistral_converter._stripped_length(text) == len(text.strip())
+
+    @pytest.mark.parametrize("text", ["Total $1,234.56 on 2024-03-31", "Résumé ² ٣ 42", ""])
+    def test_count_digits_matches_isdigit(self, text):
+        assert mistral_converter._count_digits(text) == sum(map(str.isdigit, text))
+
     def test_good_result_usable(self):
         # Build text that satisfies all quality checks:
         # - Sufficient length (>50 chars)
@@ -237,6 +257,41 @@ class TestAssessOcrQuality:
         assert "weak_page_count" in assessment
         assert "total_page_count" in assessment
 
+    def test_reports_weak_page_indices(self):
+        strong = "This is a sufficiently long paragraph with enough unique words to pass. " * 3
+        result = {
+            "full_text": strong * 2,
+            "pages": [{"text": strong}, {"text": "short"}, {"text": strong}],
+        }
+        assessment = mistral_converter.assess_ocr_quality(result)
+        assert assessment["weak_page_indices"] == [1]
+        assert assessment["weak_page_count"] == 1
+
+    def test_recheck_pages_limits_weak_page_scan(self):
+        strong = "This is a sufficiently long paragraph with enough unique words to pass. " * 3
+        result = {
+            "full_text": strong * 2,
+            "pages": [{"text": strong}, {"text": "short"}, {"text": "tiny"}, {"text": strong}],
+        }
+        checked = []
+        original = mistral_converter._is_weak_page
+
+        def tracking_is_weak(text):
+            checked.append(text)
+            return original(text)
+
+        with patch.object(mistral_converter, "_is_weak_page", side_effect=tracking_is_weak):
+            assessment = mistral_converter.assess_ocr_quality(result, recheck_pages=[2, 0, 9])
+
+        assert checked == [strong, "tiny"]
+        assert assessment["weak_page_indices"] == [2]
+        assert assessment["total_page_count"] == 4
+
+    def test_missing_pages_key(self):
+        assessment = mistral_converter.assess_ocr_quality({"full_text": "word " * 40})
+        assert assessment["weak_page_indices"] == []
+        assert assessment["total_page_count"] == 0
+
 
 # ============================================================================
 # Annotation Format Tests
@@ -310,6 +365,15 @@ class TestClientCacheInvalidation:
 
         assert all(r is None for r in results)
 
+    def test_initialized_client_returned_without_lock(self, monkeypatch):
+        sentinel = MagicMock()
+        lock = MagicMock()
+        lock.__enter__.side_effect = AssertionError("lock taken on fast path")
+        monkeypatch.setattr(mistral_converter, "_client_instance", sentinel)
+        monkeypatch.setattr(mistral_converter, "_client_lock", lock)
+
+        assert mistral_converter.get_mistral_client() is sentinel
+
 
 # ============================================================================
 # _is_weak_page Digit Ratio Tests
@@ -398,6 +462,33 @@ class TestSaveExtractedImages:
         # The saved file should contain the raw PNG bytes
         assert saved[0].read_bytes() == png_bytes
 
+    def test_unchanged_image_not_rewritten(self, tmp_path, monkeypatch):
+        """An existing file with the same payload is kept; any same-size different payload is rewritten."""
+        import base64
+
+        monkeypatch.setattr(config, "MISTRAL_INCLUDE_IMAGES", True)
+        monkeypatch.setattr(config, "OUTPUT_IMAGES_DIR", tmp_path)
+        file_path = tmp_path / "test.pdf"
+        file_path.touch()
+
+        def _result(payload: bytes):
+            return {"pages": [{"page_number": 1, "images": [{"base64": base64.b64encode(payload).decode()}]}]}
+
+        (first,) = mistral_converter.save_extracted_images(_result(b"image-bytes"), file_path)
+
+        with patch.object(mistral_converter.utils, "atomic_write_chunks") as mock_write:
+            assert mistral_converter.save_extracted_images(_result(b"image-bytes"), file_path) == [first]
+        mock_write.assert_not_called()
+
+        mistral_converter.save_extracted_images(_result(b"other-bytes"), file_path)
+        assert first.read_bytes() == b"other-bytes"
+
+        # Same size and same leading chunk, different tail
+        long_payload = b"a" * 300_000
+        mistral_converter.save_extracted_images(_result(long_payload), file_path)
+        mistral_converter.save_extracted_images(_result(long_payload[:-1] + b"b"), file_path)
+        assert first.read_bytes() == long_payload[:-1] + b"b"
+
 
 # ============================================================================
 # Session page commit Tests
@@ -641,6 +732,34 @@ class TestParseDictResponse:
         assert len(result["pages"]) == 1
         assert result["full_text"] == "Single page content"
 
+    def test_table_placeholders_expanded(self):
+        response = {
+            "pages": [
+                {
+                    "markdown": "Intro\n[tbl-0.md](tbl-0.md)\nsee [tbl-1.md](tbl-1.md) and [x](y)",
+                    "tables": [
+                        {"id": "tbl-0.md", "content": "| a |\n|---|"},
+                        {"id": "tbl-1.md", "content": ""},
+                    ],
+                }
+            ]
+        }
+        result = {"full_text": "", "pages": []}
+        mistral_converter._parse_dict_response(response, result)
+        text = result["pages"][0]["text"]
+        assert "| a |\n|---|" in text
+        assert "[tbl-0.md]" not in text
+        # Tables without content and unrelated links are left as-is
+        assert "[tbl-1.md](tbl-1.md)" in text
+        assert "[x](y)" in text
+
+    def test_out_of_order_pages_sorted_by_index(self):
+        response = {"pages": [{"index": 1, "markdown": "second"}, {"index": 0, "markdown": "first"}]}
+        result = {"full_text": "", "pages": []}
+        mistral_converter._parse_dict_response(response, result)
+        assert [p["page_number"] for p in result["pages"]] == [1, 2]
+        assert result["full_text"] == "first\n\nsecond\n\n"
+
 
 # ============================================================================
 # _extract_structured_outputs Tests
@@ -767,6 +886,17 @@ class TestParseOcrResponse:
         result = mistral_converter._parse_ocr_response(response, tmp_path / "err.pdf")
         assert result["file_name"] == "err.pdf"
 
+    def test_parse_error_traceback_attached_to_debug_record(self, tmp_path, caplog):
+        response = MagicMock()
+        response.pages = [MagicMock(markdown=None, text=None, content=None)]
+        with patch.object(mistral_converter, "_parse_pages_response", side_effect=RuntimeError("bad page")):
+            with caplog.at_level("DEBUG", logger=mistral_converter.logger.name):
+                result = mistral_converter._parse_ocr_response(response, tmp_path / "err.pdf")
+
+        assert result["parse_error"] == "bad page"
+        debug_records = [r for r in caplog.records if r.levelname == "DEBUG" and r.exc_info]
+        assert debug_records and debug_records[0].exc_info[0] is RuntimeError
+
 
 # ============================================================================
 # _create_markdown_output Tests
@@ -839,9 +969,10 @@ class TestSaveStructuredOutputs:
             "document_annotation": None,
         }
 
-        mistral_converter._save_structured_outputs(file_path, ocr_result)
+        saved = mistral_converter._save_structured_outputs(file_path, ocr_result)
         json_files = list(tmp_path.glob("*bbox*.json"))
         assert len(json_files) == 1
+        assert saved == json_files
 
     def test_saves_document_annotation(self, tmp_path, monkeypatch):
         monkeypatch.setattr(config, "OUTPUT_MD_DIR", tmp_path)
@@ -869,9 +1000,10 @@ class TestSaveStructuredOutputs:
             "document_annotation": None,
         }
 
-        mistral_converter._save_structured_outputs(file_path, ocr_result)
+        saved = mistral_converter._save_structured_outputs(file_path, ocr_result)
         json_files = list(tmp_path.glob("*.json"))
         assert len(json_files) == 0
+        assert saved == []
 
 
 # ============================================================================
@@ -996,6 +1128,76 @@ class TestSaveExtractedImagesAdditional:
         saved = mistral_converter.save_extracted_images(ocr_result, tmp_path / "test.pdf")
         assert saved == []
 
+    def test_chunked_decode_matches_b64decode(self, tmp_path, monkeypatch):
+        import base64
+
+        monkeypatch.setattr(config, "MISTRAL_INCLUDE_IMAGES", True)
+        monkeypatch.setattr(config, "OUTPUT_IMAGES_DIR", tmp_path)
+        monkeypatch.setattr(mistral_converter, "_BASE64_DECODE_CHUNK_CHARS", 8)
+
+        payload = bytes(range(256)) * 3 + b"tail"
+        encoded = base64.b64encode(payload).decode()
+        wrapped = "\n".join(encoded[i : i + 76] for i in range(0, len(encoded), 76))
+        ocr_result = {
+            "pages": [
+                {
+                    "page_number": 1,
+                    "images": [
+                        {"base64": encoded},
+                        {"base64": "data:image/png;base64," + wrapped},
+                        {"base64": "not base64!"},
+                        {"base64": encoded},
+                    ],
+                }
+            ]
+        }
+
+        saved = mistral_converter.save_extracted_images(ocr_result, tmp_path / "test.pdf")
+
+        assert [p.name for p in saved] == ["page_1_image_1.png", "page_1_image_2.png", "page_1_image_3.png"]
+        assert all(p.read_bytes() == payload for p in saved)
+        assert not list(saved[0].parent.glob("*.tmp"))
+
+    def test_gap_free_images_not_renamed(self, tmp_path, monkeypatch):
+        import base64
+
+        monkeypatch.setattr(config, "MISTRAL_INCLUDE_IMAGES", True)
+        monkeypatch.setattr(config, "OUTPUT_IMAGES_DIR", tmp_path)
+
+        renamed = []
+        original_replace = mistral_converter.Path.replace
+
+        def tracking_replace(self, target):
+            # Atomic writes rename their temp files; only count image-to-image renames
+            if self.suffix == ".png":
+                renamed.append(self)
+            return original_replace(self, target)
+
+        monkeypatch.setattr(mistral_converter.Path, "replace", tracking_replace)
+        encoded = base64.b64encode(b"image").decode()
+        ocr_result = {"pages": [{"page_number": 2, "images": [{"base64": encoded}, {"base64": encoded}]}]}
+
+        saved = mistral_converter.save_extracted_images(ocr_result, tmp_path / "test.pdf")
+
+        assert [p.name for p in saved] == ["page_2_image_1.png", "page_2_image_2.png"]
+        assert renamed == []
+
+    def test_unexpected_write_error_propagates(self, tmp_path, monkeypatch):
+        import base64
+
+        monkeypatch.setattr(config, "MISTRAL_INCLUDE_IMAGES", True)
+        monkeypatch.setattr(config, "OUTPUT_IMAGES_DIR", tmp_path)
+        monkeypatch.setattr(
+            mistral_converter.utils, "atomic_write_chunks", MagicMock(side_effect=TypeError("bad chunk"))
+        )
+        encoded = base64.b64encode(b"image").decode()
+        ocr_result = {
+            "pages": [{"page_number": 1, "images": [{"base64": "data:image/png;base64"}, {"base64": encoded}]}]
+        }
+
+        with pytest.raises(TypeError, match="bad chunk"):
+            mistral_converter.save_extracted_images(ocr_result, tmp_path / "test.pdf")
+
 
 # ============================================================================
 # optimize_image Tests
@@ -1049,6 +1251,8 @@ class TestOptimizeImage:
 
         resized.save.assert_called_once()
         assert "optimized" in str(result)
+        # Upload-only temp file: no exhaustive PNG optimize pass
+        assert "optimize" not in resized.save.call_args[1]
 
     def test_jpeg_uses_quality(self, tmp_path, monkeypatch):
         monkeypatch.setattr(config, "MISTRAL_ENABLE_IMAGE_OPTIMIZATION", True)
@@ -1072,6 +1276,25 @@ class TestOptimizeImage:
         save_call = resized.save.call_args
         assert save_call[1].get("format") == "JPEG"
 
+    def test_large_jpeg_uses_draft_decode(self, tmp_path, monkeypatch):
+        from PIL import Image, JpegImagePlugin
+
+        monkeypatch.setattr(config, "MISTRAL_ENABLE_IMAGE_OPTIMIZATION", True)
+        monkeypatch.setattr(config, "MISTRAL_MAX_IMAGE_DIMENSION", 400)
+        monkeypatch.setattr(config, "MISTRAL_IMAGE_QUALITY_THRESHOLD", 85)
+        img_path = tmp_path / "scan.jpg"
+        Image.new("RGB", (2000, 1000), "white").save(img_path, format="JPEG")
+
+        with patch.object(
+            JpegImagePlugin.JpegImageFile, "draft", autospec=True, side_effect=JpegImagePlugin.JpegImageFile.draft
+        ) as mock_draft:
+            result = mistral_converter.optimize_image(img_path)
+
+        mock_draft.assert_called_once()
+        assert mock_draft.call_args[0][2] == (400, 200)
+        with Image.open(result) as out:
+            assert out.size == (400, 200)
+
     def test_error_returns_original(self, tmp_path, monkeypatch):
         monkeypatch.setattr(config, "MISTRAL_ENABLE_IMAGE_OPTIMIZATION", True)
         img_path = tmp_path / "test.png"
@@ -1107,20 +1330,60 @@ class TestPreprocessImage:
         mock_img.__enter__ = MagicMock(return_value=mock_img)
         mock_img.__exit__ = MagicMock(return_value=False)
         mock_img.convert.return_value = mock_img
+        mock_img.size = (800, 600)  # within MISTRAL_MAX_IMAGE_DIMENSION: no downscale
 
         mock_enhance_cls = MagicMock()
         mock_enhance_cls.return_value.enhance.return_value = mock_img
 
         with patch.object(mistral_converter, "Image") as mock_pil:
             mock_pil.open.return_value = mock_img
-            with patch.dict(
-                "sys.modules",
-                {"PIL.ImageEnhance": MagicMock(Contrast=mock_enhance_cls, Sharpness=mock_enhance_cls)},
+            with patch(
+                "PIL.ImageEnhance", MagicMock(Contrast=mock_enhance_cls, Sharpness=mock_enhance_cls), create=True
             ):
                 result = mistral_converter.preprocess_image(img_path)
 
         assert "preprocessed" in str(result)
 
+    def test_oversized_image_downscaled_before_intermediate_is_written(self, tmp_path, monkeypatch):
+        from PIL import Image
+
+        monkeypatch.setattr(config, "MISTRAL_ENABLE_IMAGE_PREPROCESSING", True)
+        monkeypatch.setattr(config, "MISTRAL_ENABLE_IMAGE_OPTIMIZATION", True)
+        monkeypatch.setattr(config, "MISTRAL_MAX_IMAGE_DIMENSION", 300)
+        img_path = tmp_path / "scan.png"
+        Image.new("RGB", (1200, 600), "white").save(img_path)
+
+        preprocessed = mistral_converter.preprocess_image(img_path)
+        with Image.open(preprocessed) as out:
+            assert out.size == (300, 150)
+        # Already within bounds, so optimize_image has nothing left to re-encode
+        assert mistral_converter.optimize_image(preprocessed) == preprocessed
+
+    def test_png_intermediate_skips_exhaustive_optimize(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "MISTRAL_ENABLE_IMAGE_PREPROCESSING", True)
+        img_path = tmp_path / "test.png"
+        img_path.write_bytes(b"fake")
+
+        mock_img = MagicMock()
+        mock_img.__enter__ = MagicMock(return_value=mock_img)
+        mock_img.__exit__ = MagicMock(return_value=False)
+        mock_img.convert.return_value = mock_img
+        mock_img.size = (800, 600)  # within MISTRAL_MAX_IMAGE_DIMENSION: no downscale
+
+        mock_enhance_cls = MagicMock()
+        mock_enhance_cls.return_value.enhance.return_value = mock_img
+
+        with patch.object(mistral_converter, "Image") as mock_pil:
+            mock_pil.open.return_value = mock_img
+            with patch(
+                "PIL.ImageEnhance", MagicMock(Contrast=mock_enhance_cls, Sharpness=mock_enhance_cls), create=True
+            ):
+                mistral_converter.preprocess_image(img_path)
+
+        save_kwargs = mock_img.save.call_args[1]
+        assert save_kwargs["format"] == "PNG"
+        assert "optimize" not in save_kwargs
+
     def test_error_returns_original(self, tmp_path, monkeypatch):
         monkeypatch.setattr(config, "MISTRAL_ENABLE_IMAGE_PREPROCESSING", True)
         img_path = tmp_path / "test.png"
@@ -1215,6 +1478,38 @@ class TestUploadFileForOcr:
         assert result == "https://signed.url/doc"
         mock_client.files.upload.assert_called_once()
 
+    def test_recent_upload_of_unchanged_file_reused(self, tmp_path, monkeypatch):
+        """A second request for the same unchanged file reuses the fresh signed URL."""
+        monkeypatch.setattr(config, "MISTRAL_SIGNED_URL_EXPIRY", 1)
+        monkeypatch.setattr(config, "MISTRAL_SIGNED_URL_REFRESH_THRESHOLD", 0.9)
+
+        pdf_file = tmp_path / "test.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4 fake content")
+        mock_client = MagicMock()
+        mock_client.files.upload.return_value = MagicMock(id="file_123")
+        mock_client.files.get_signed_url.return_value = MagicMock(url="https://signed.url/doc")
+
+        first = mistral_converter.upload_file_for_ocr(mock_client, pdf_file)
+        assert mistral_converter.upload_file_for_ocr(mock_client, pdf_file) == first
+        mock_client.files.upload.assert_called_once()
+
+        # Past the short reuse window the file is uploaded again
+        now = mistral_converter.time.time()
+        with patch.object(mistral_converter.time, "time", return_value=now + 61):
+            mistral_converter.upload_file_for_ocr(mock_client, pdf_file)
+        assert mock_client.files.upload.call_count == 2
+
+    def test_recent_upload_not_shared_across_clients(self, tmp_path):
+        """Uploads are remembered per client object, not per object id."""
+        pdf_file = tmp_path / "test.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4 fake content")
+        clients = [MagicMock(), MagicMock()]
+        for client in clients:
+            client.files.upload.return_value = MagicMock(id="file_123")
+            client.files.get_signed_url.return_value = MagicMock(url="https://signed.url/doc")
+            mistral_converter.upload_file_for_ocr(client, pdf_file)
+            client.files.upload.assert_called_once()
+
     def test_upload_with_image_preprocessing(self, tmp_path, monkeypatch):
         monkeypatch.setattr(config, "MISTRAL_SIGNED_URL_EXPIRY", 24)
         monkeypatch.setattr(config, "IMAGE_EXTENSIONS", {"png", "jpg", "jpeg"})
@@ -1284,6 +1579,25 @@ class TestUploadFileForOcr:
 class TestProcessWithOcr:
     """Test OCR processing pipeline."""
 
+    def test_requests_spaced_by_rate_limit(self, monkeypatch):
+        monkeypatch.setattr(config, "MISTRAL_OCR_REQUESTS_PER_SECOND", 4.0)
+        monkeypatch.setattr(mistral_converter, "_ocr_next_request_at", 0.0)
+        monkeypatch.setattr(mistral_converter.time, "monotonic", lambda: 100.0)
+        sleeps = []
+        monkeypatch.setattr(mistral_converter.time, "sleep", sleeps.append)
+
+        for _ in range(3):
+            mistral_converter._wait_for_ocr_request_slot()
+
+        assert sleeps == [0.25, 0.5]
+
+    def test_rate_limit_disabled_never_sleeps(self, monkeypatch):
+        monkeypatch.setattr(config, "MISTRAL_OCR_REQUESTS_PER_SECOND", 0.0)
+        monkeypatch.setattr(mistral_converter, "_ocr_next_request_at", 1e12)
+        monkeypatch.setattr(mistral_converter.time, "sleep", lambda s: pytest.fail("slept"))
+
+        mistral_converter._wait_for_ocr_request_slot()
+
     def test_successful_pdf_processing(self, tmp_path, monkeypatch):
         monkeypatch.setattr(config, "IMAGE_EXTENSIONS", {"png", "jpg", "jpeg"})
         monkeypatch.setattr(config, "MISTRAL_INCLUDE_IMAGES", False)
@@ -1409,6 +1723,24 @@ class TestProcessWithOcr:
         assert success is False
         assert "authentication" in error.lower() or "401" in error
 
+    def test_transient_status_reports_exhausted_retries(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "RETRY_MAX_ELAPSED_TIME_MS", 60000)
+        pdf_file = tmp_path / "test.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4")
+
+        err = Exception("Service Unavailable")
+        err.status_code = 503
+        mock_client = MagicMock()
+        mock_client.ocr.process.side_effect = err
+
+        with patch.object(mistral_converter, "_prepare_ocr_document", return_value=(MagicMock(), "https://u")):
+            with patch.object(mistral_converter, "build_ocr_process_kwargs", return_value={}):
+                success, result, error = mistral_converter.process_with_ocr(mock_client, pdf_file)
+
+        assert success is False
+        assert mock_client.ocr.process.call_count == 1
+        assert "HTTP 503" in error and "60000 ms" in error
+
     def test_image_file_uses_image_chunk(self, tmp_path, monkeypatch):
         monkeypatch.setattr(config, "IMAGE_EXTENSIONS", {"png", "jpg", "jpeg"})
         monkeypatch.setattr(config, "MISTRAL_INCLUDE_IMAGES", False)
@@ -1541,6 +1873,28 @@ class TestDownloadBatchResults:
         assert path.exists()
         assert path.read_text() == '{"result": "streamed"}\n'
 
+    def test_file_like_download_is_read_in_chunks(self, tmp_path, monkeypatch):
+        import io
+
+        monkeypatch.setattr(mistral_converter, "_BATCH_DOWNLOAD_CHUNK_BYTES", 4)
+        mock_job = MagicMock()
+        mock_job.status = "SUCCESS"
+        mock_job.output_file = "output_file_id"
+        stream = MagicMock(spec=["read"])
+        stream.read.side_effect = io.BytesIO(b'{"result": "chunked"}\n').read
+
+        with patch.object(mistral_converter, "get_mistral_client") as mock_get:
+            mock_client = MagicMock()
+            mock_client.batch.jobs.get.return_value = mock_job
+            mock_client.files.download.return_value = stream
+            mock_get.return_value = mock_client
+
+            ok, path, err = mistral_converter.download_batch_results("job_ok_stream", output_dir=tmp_path)
+
+        assert ok is True
+        assert path.read_text() == '{"result": "chunked"}\n'
+        assert all(call.args == (4,) for call in stream.read.call_args_list)
+
     def test_job_not_complete(self):
         mock_job = MagicMock()
         mock_job.status = "RUNNING"
@@ -1647,6 +2001,111 @@ class TestListBatchJobs:
 class TestConvertWithMistralOcr:
     """Test full OCR conversion pipeline."""
 
+    def test_long_pdf_ocr_in_page_chunks_from_one_upload(self, tmp_path, monkeypatch):
+        import local_converter
+
+        monkeypatch.setattr(config, "MISTRAL_OCR_CHUNK_PAGES", 2)
+        monkeypatch.setattr(config, "OCR_MAX_WEAK_PAGE_WORKERS", 3)
+        monkeypatch.setattr(local_converter, "analyze_file_content", lambda p: {"page_count": 5})
+        pdf = tmp_path / "long.pdf"
+        pdf.write_bytes(b"%PDF-1.4")
+        calls = []
+
+        def fake_ocr(client, file_path, pages=None, signed_url=None, **kwargs):
+            calls.append((tuple(pages), signed_url))
+            # Chunk results arrive out of page order to exercise the merge
+            chunk_pages = [{"page_number": i + 1, "api_page_index": i, "text": f"p{i}"} for i in reversed(pages)]
+            return True, {"pages": chunk_pages, "usage_info": {"pages_processed": len(pages)}}, None
+
+        with patch.object(mistral_converter, "upload_file_for_ocr", return_value="https://signed") as upload:
+            with patch.object(mistral_converter, "process_with_ocr", side_effect=fake_ocr):
+                ok, result, err = mistral_converter._ocr_document(MagicMock(), pdf)
+
+        assert ok is True
+        upload.assert_called_once()
+        assert sorted(calls) == [((0, 1), "https://signed"), ((2, 3), "https://signed"), ((4,), "https://signed")]
+        assert [p["api_page_index"] for p in result["pages"]] == [0, 1, 2, 3, 4]
+        assert result["full_text"] == "p0\n\np1\n\np2\n\np3\n\np4\n\n"
+        assert result["usage_info"]["pages_processed"] == 5
+
+    def test_failed_page_chunk_fails_document(self, tmp_path, monkeypatch):
+        import local_converter
+
+        monkeypatch.setattr(config, "MISTRAL_OCR_CHUNK_PAGES", 2)
+        monkeypatch.setattr(local_converter, "analyze_file_content", lambda p: {"page_count": 3})
+        pdf = tmp_path / "long.pdf"
+        pdf.write_bytes(b"%PDF-1.4")
+
+        def fake_ocr(client, file_path, pages=None, signed_url=None, **kwargs):
+            if pages == [2]:
+                return False, None, "boom"
+            return True, {"pages": [{"api_page_index": i, "text": "x"} for i in pages]}, None
+
+        with patch.object(mistral_converter, "upload_file_for_ocr", return_value="https://signed"):
+            with patch.object(mistral_converter, "process_with_ocr", side_effect=fake_ocr):
+                ok, result, err = mistral_converter._ocr_document(MagicMock(), pdf)
+
+        assert ok is False and result is None
+        assert err == "OCR failed for pages 3-3: boom"
+
+    def test_failed_page_chunk_cancels_remaining_chunks(self, tmp_path, monkeypatch):
+        import local_converter
+
+        monkeypatch.setattr(config, "MISTRAL_OCR_CHUNK_PAGES", 1)
+        monkeypatch.setattr(config, "OCR_MAX_WEAK_PAGE_WORKERS", 1)
+        monkeypatch.setattr(local_converter, "analyze_file_content", lambda p: {"page_count": 4})
+        pdf = tmp_path / "long.pdf"
+        pdf.write_bytes(b"%PDF-1.4")
+        calls = []
+
+        def fake_ocr(client, file_path, pages=None, signed_url=None, **kwargs):
+            calls.append(pages)
+            return False, None, "boom"
+
+        with patch.object(mistral_converter, "upload_file_for_ocr", return_value="https://signed"):
+            with patch.object(mistral_converter, "process_with_ocr", side_effect=fake_ocr):
+                ok, _, err = mistral_converter._ocr_document(MagicMock(), pdf)
+
+        assert ok is False
+        assert err == "OCR failed for pages 1-1: boom"
+        assert len(calls) < 4
+
+    def test_page_chunks_reserve_session_budget_once(self, tmp_path, monkeypatch):
+        import local_converter
+
+        monkeypatch.setattr(config, "MISTRAL_OCR_CHUNK_PAGES", 2)
+        monkeypatch.setattr(config, "MAX_PAGES_PER_SESSION", 4)
+        monkeypatch.setattr(local_converter, "analyze_file_content", lambda p: {"page_count": 5})
+        mistral_converter.reset_session_page_counter()
+        pdf = tmp_path / "long.pdf"
+        pdf.write_bytes(b"%PDF-1.4")
+        mock_client = MagicMock()
+        mock_client.ocr.process.side_effect = lambda **kw: {
+            "pages": [{"index": i, "markdown": f"p{i}"} for i in kw["pages"]]
+        }
+
+        try:
+            with patch.object(mistral_converter, "upload_file_for_ocr", return_value="https://signed"):
+                ok, result, err = mistral_converter._ocr_document(mock_client, pdf)
+            assert ok is True
+            assert len(result["pages"]) == 5
+            # Committed once for the whole document; chunks did not reserve on their own
+            assert mistral_converter._session_pages_processed == 5
+            assert mistral_converter._session_pages_inflight == 0
+        finally:
+            mistral_converter.reset_session_page_counter()
+
+    def test_page_chunks_apply_image_limit_to_whole_document(self, monkeypatch):
+        monkeypatch.setattr(config, "MISTRAL_IMAGE_LIMIT", 3)
+        chunks = [
+            {"pages": [{"api_page_index": i, "text": "x", "images": [{"id": f"{i}a"}, {"id": f"{i}b"}]}]}
+            for i in range(3)
+        ]
+
+        merged = mistral_converter._merge_chunk_results(Path("doc.pdf"), chunks)
+
+        assert [[img["id"] for img in page["images"]] for page in merged["pages"]] == [["0a", "0b"], ["1a"], []]
+
     def test_no_client(self, monkeypatch):
         monkeypatch.setattr(config, "MISTRAL_API_KEY", "")
         mistral_converter.reset_mistral_client()
@@ -1700,7 +2159,7 @@ class TestConvertWithMistralOcr:
         fresh = {"full_text": "new", "pages": [{"text": "new", "page_number": 1}]}
 
         with patch.object(mistral_converter, "get_mistral_client", return_value=MagicMock()):
-            with patch("utils.cache.get_entry", return_value=bad_entry):
+            with patch("utils.cache.get_entry", return_value=bad_entry), patch("utils.cache.set"):
                 with patch.object(
                     mistral_converter,
                     "process_with_ocr",
@@ -1718,6 +2177,34 @@ class TestConvertWithMistralOcr:
         assert ok is True
         mock_pw.assert_called_once()
 
+    def test_cache_contract_built_once_per_document(self, tmp_path, monkeypatch):
+        """The contract built for the lookup is reused when storing the fresh result."""
+        monkeypatch.setattr(config, "OUTPUT_MD_DIR", tmp_path)
+        monkeypatch.setattr(config, "SAVE_MISTRAL_JSON", False)
+        monkeypatch.setattr(config, "ENABLE_OCR_QUALITY_ASSESSMENT", False)
+
+        pdf = tmp_path / "test.pdf"
+        pdf.write_bytes(b"%PDF")
+        fresh = {"full_text": "new", "pages": [{"text": "new", "page_number": 1}]}
+        contract = {"contract_type": "mistral_ocr"}
+
+        with patch.object(mistral_converter, "get_mistral_client", return_value=MagicMock()):
+            with patch("utils.cache.get_entry", return_value=None):
+                with patch("utils.cache.set") as mock_set:
+                    with patch.object(
+                        mistral_converter,
+                        "build_mistral_ocr_cache_contract_metadata",
+                        return_value=contract,
+                    ) as mock_contract:
+                        with patch.object(mistral_converter, "process_with_ocr", return_value=(True, fresh, None)):
+                            with patch.object(mistral_converter, "_write_ocr_outputs", return_value=tmp_path / "o.md"):
+                                with patch.object(mistral_converter, "save_extracted_images"):
+                                    ok, _, _ = mistral_converter.convert_with_mistral_ocr(pdf, use_cache=True)
+
+        assert ok is True
+        mock_contract.assert_called_once()
+        assert mock_set.call_args.kwargs["metadata"] is contract
+
     def test_ocr_failure(self, tmp_path):
         pdf = tmp_path / "test.pdf"
         pdf.write_bytes(b"%PDF")
@@ -1778,12 +2265,32 @@ class TestOcrRequestHelpers:
                 )
         assert "retries" in body
 
+    def test_build_ocr_process_kwargs_image_base64_override(self, monkeypatch):
+        monkeypatch.setattr(config, "MISTRAL_INCLUDE_IMAGES", True)
+        with patch.object(mistral_converter, "_ocr_shared_optional_params", return_value={}):
+            default = mistral_converter.build_ocr_process_kwargs(document={}, model="m", include_retries=False)
+            override = mistral_converter.build_ocr_process_kwargs(
+                document={}, model="m", include_retries=False, include_image_base64=False
+            )
+        assert default["include_image_base64"] is True
+        assert override["include_image_base64"] is False
+
     def test_build_qna_messages_stable_shape(self):
         a = mistral_converter._build_qna_messages("https://doc", "hello?")
         b = mistral_converter._build_qna_messages("https://doc", "hello?")
         assert a == b
         assert a[1]["content"][1]["type"] == "document_url"
 
+    def test_sdk_version_lookup_is_memoized(self):
+        mistral_converter._get_mistralai_package_version.cache_clear()
+        try:
+            with patch.object(mistral_converter, "_pkg_version", return_value="1.2.3") as mock_version:
+                assert mistral_converter._get_mistralai_package_version() == "1.2.3"
+                assert mistral_converter._get_mistralai_package_version() == "1.2.3"
+            assert mock_version.call_count == 1
+        finally:
+            mistral_converter._get_mistralai_package_version.cache_clear()
+
 
 # ============================================================================
 # query_document_file Tests
@@ -1976,6 +2483,62 @@ class TestProcessOcrResultPipeline:
 
         assert ok is True
 
+    def test_output_stem_computed_once(self, tmp_path, monkeypatch, caplog):
+        monkeypatch.setattr(config, "OUTPUT_MD_DIR", tmp_path)
+        monkeypatch.setattr(config, "SAVE_MISTRAL_JSON", True)
+        monkeypatch.setattr(config, "ENABLE_OCR_QUALITY_ASSESSMENT", False)
+        monkeypatch.setattr(config, "INCLUDE_METADATA", False)
+        monkeypatch.setattr(config, "GENERATE_TXT_OUTPUT", False)
+
+        pdf = tmp_path / "test.pdf"
+        pdf.write_bytes(b"%PDF")
+        ocr_result = {
+            "full_text": "Hello",
+            "pages": [{"text": "Hello", "page_number": 1, "images": []}],
+            "bbox_annotations": [{"x": 1}],
+            "document_annotation": {"k": "v"},
+        }
+
+        with patch("utils.safe_output_stem", return_value="stem") as mock_stem, caplog.at_level("INFO"):
+            with patch("utils.cache.set"):
+                ok, path, err = mistral_converter._process_ocr_result_pipeline(
+                    MagicMock(), pdf, ocr_result, True, False, False
+                )
+
+        assert ok is True
+        assert mock_stem.call_count == 1
+        assert path == tmp_path / "stem_mistral_ocr.md"
+        assert (tmp_path / "stem_ocr_metadata.json").exists()
+        assert (tmp_path / "stem_bbox_annotations.json").exists()
+        assert (tmp_path / "stem_document_annotation.json").exists()
+        summaries = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Saved Mistral OCR outputs")]
+        assert summaries == [
+            "Saved Mistral OCR outputs: stem_mistral_ocr.md, stem_ocr_metadata.json, "
+            "stem_bbox_annotations.json, stem_document_annotation.json"
+        ]
+
+    def test_image_save_failure_is_non_fatal(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "OUTPUT_MD_DIR", tmp_path)
+        monkeypatch.setattr(config, "SAVE_MISTRAL_JSON", False)
+        monkeypatch.setattr(config, "ENABLE_OCR_QUALITY_ASSESSMENT", False)
+        monkeypatch.setattr(config, "INCLUDE_METADATA", False)
+        monkeypatch.setattr(config, "GENERATE_TXT_OUTPUT", False)
+
+        pdf = tmp_path / "test.pdf"
+        pdf.write_bytes(b"%PDF")
+        ocr_result = {"full_text": "Hello", "pages": [{"text": "Hello", "page_number": 1, "images": []}]}
+
+        with patch.object(mistral_converter, "save_extracted_images", side_effect=OSError("disk full")) as mock_save:
+            with patch("utils.cache.set"):
+                ok, path, err = mistral_converter._process_ocr_result_pipeline(
+                    MagicMock(), pdf, ocr_result, True, False, False
+                )
+
+        assert ok is True
+        assert err is None
+        assert path.exists()
+        mock_save.assert_called_once()
+
 
 # ============================================================================
 # get_mistral_client - initialization paths
@@ -2102,6 +2665,20 @@ class TestGetRetryConfigFull:
         mock_retries.BackoffStrategy.assert_called_once()
         mock_retries.RetryConfig.assert_called_once()
 
+    def test_config_object_reused_until_settings_change(self, monkeypatch):
+        monkeypatch.setattr(config, "MAX_RETRIES", 3)
+        monkeypatch.setattr(config, "RETRY_INITIAL_INTERVAL_MS", 700)
+        mock_retries = MagicMock()
+        mock_retries.RetryConfig.side_effect = lambda **kw: MagicMock()
+
+        with patch.object(mistral_converter, "retries", mock_retries):
+            first = mistral_converter.get_retry_config()
+            assert mistral_converter.get_retry_config() is first
+            monkeypatch.setattr(config, "RETRY_INITIAL_INTERVAL_MS", 900)
+            assert mistral_converter.get_retry_config() is not first
+
+        assert mock_retries.RetryConfig.call_count == 2
+
     def test_exception_returns_none(self, monkeypatch):
         monkeypatch.setattr(config, "MAX_RETRIES", 3)
 
@@ -2432,6 +3009,7 @@ class TestPreprocessImageFull:
 
         mock_contrast_enhanced = MagicMock()
         mock_sharp_enhanced = MagicMock()
+        mock_sharp_enhanced.size = (800, 600)  # within MISTRAL_MAX_IMAGE_DIMENSION: no downscale
 
         mock_image_mod = MagicMock()
         mock_image_mod.open.return_value = mock_src
@@ -2990,6 +3568,32 @@ class TestImproveWeakPages:
         kwargs = m_ocr.call_args[1]
         assert kwargs.get("pages") == [2]
 
+    def test_reocr_pages_cached_by_content(self, tmp_path, monkeypatch):
+        """A second run on identical bytes replays cached pages without uploading or re-OCR."""
+        monkeypatch.setattr(
+            mistral_converter.utils, "cache", mistral_converter.utils.IntelligentCache(tmp_path / "cache")
+        )
+        pdf = tmp_path / "doc.pdf"
+        pdf.write_bytes(b"%PDF-1.4 same bytes")
+        improved = {"text": "much longer improved text " * 20, "page_number": 1}
+
+        with patch.object(mistral_converter, "upload_file_for_ocr", return_value="https://u") as m_upload:
+            with patch.object(
+                mistral_converter,
+                "process_with_ocr",
+                return_value=(True, {"pages": [improved]}, None),
+            ) as m_ocr:
+                first = mistral_converter.improve_weak_pages(
+                    MagicMock(), pdf, {"pages": [{"text": "short", "page_number": 1}]}, "model", use_cache=True
+                )
+                second = mistral_converter.improve_weak_pages(
+                    MagicMock(), pdf, {"pages": [{"text": "short", "page_number": 1}]}, "model", use_cache=True
+                )
+
+        assert m_ocr.call_count == 1
+        assert m_upload.call_count == 1
+        assert first["full_text"] == second["full_text"] == improved["text"]
+
     def test_improvement_fails_keeps_original(self, monkeypatch):
         monkeypatch.setattr(config, "MAX_CONCURRENT_FILES", 1)
         monkeypatch.setattr(config, "MISTRAL_SIGNED_URL_EXPIRY", 24)
@@ -3032,6 +3636,54 @@ class TestImproveWeakPages:
 
         assert result["pages"][0]["text"] == weak_text
 
+    def test_full_text_untouched_when_nothing_improved(self):
+        ocr_result = {"pages": [{"text": "short", "page_number": 1}], "full_text": "short\n\n"}
+
+        with patch.object(mistral_converter, "upload_file_for_ocr", return_value="https://signed.url"):
+            with patch.object(mistral_converter, "process_with_ocr", return_value=(False, None, "OCR failed")):
+                result = mistral_converter.improve_weak_pages(MagicMock(), Path("test.pdf"), ocr_result, "model")
+
+        assert result["full_text"] == "short\n\n"
+
+    def test_single_worker_runs_inline(self, monkeypatch):
+        import threading
+
+        monkeypatch.setattr(config, "OCR_MAX_WEAK_PAGE_WORKERS", 1)
+        ocr_result = {"pages": [{"text": "a"}, {"text": "b"}]}
+        seen_threads = []
+
+        def _improve(group):
+            seen_threads.append(threading.current_thread())
+            return [(idx, {"text": "improved page text"} if idx == 1 else None) for idx in group]
+
+        groups = mistral_converter._group_weak_pages([0, 1])
+        improved = mistral_converter._run_weak_page_improvements(groups, _improve, ocr_result)
+
+        assert improved == 1
+        assert groups == [[0, 1]]
+        assert seen_threads == [threading.current_thread()]
+        assert [p["text"] for p in ocr_result["pages"]] == ["a", "improved page text"]
+
+    def test_weak_pages_coalesced_into_worker_requests(self, monkeypatch):
+        monkeypatch.setattr(config, "OCR_MAX_WEAK_PAGE_WORKERS", 2)
+        ocr_result = {"pages": [{"text": "x", "api_page_index": i} for i in range(5)]}
+
+        def _fake_ocr(client, file_path, model, pages, signed_url, include_image_base64):
+            # Reply out of order to exercise index-based matching
+            return (
+                True,
+                {"pages": [{"text": f"improved page {i} " * 10, "api_page_index": i} for i in reversed(pages)]},
+                None,
+            )
+
+        with patch.object(mistral_converter, "upload_file_for_ocr", return_value="https://signed.url"):
+            with patch.object(mistral_converter, "process_with_ocr", side_effect=_fake_ocr) as mock_ocr:
+                mistral_converter.improve_weak_pages(MagicMock(), Path("doc.pdf"), ocr_result, "model")
+
+        assert sorted(c[1]["pages"] for c in mock_ocr.call_args_list) == [[0, 2, 4], [1, 3]]
+        for i, page in enumerate(ocr_result["pages"]):
+            assert page["text"].startswith(f"improved page {i} ")
+
 
 # ============================================================================
 # _process_ocr_result_pipeline - weak page improvement path
@@ -3866,6 +4518,7 @@ class TestPreprocessImageFormatBranches:
         mock_src.__exit__ = MagicMock(return_value=False)
 
         mock_enhanced = MagicMock()
+        mock_enhanced.size = (800, 600)  # within MISTRAL_MAX_IMAGE_DIMENSION: no downscale
 
         mock_image_mod = MagicMock()
         mock_image_mod.open.return_value = mock_src
@@ -3899,6 +4552,7 @@ class TestPreprocessImageFormatBranches:
         mock_src.__exit__ = MagicMock(return_value=False)
 
         mock_enhanced = MagicMock()
+        mock_enhanced.size = (800, 600)  # within MISTRAL_MAX_IMAGE_DIMENSION: no downscale
 
         mock_image_mod = MagicMock()
         mock_image_mod.open.return_value = mock_src
@@ -4477,6 +5131,17 @@ class TestIsWeakPageBranches:
         text = "ab\ncd\nef\ngh\nij\nkl\nmn\nop\nqr\nst"
         assert mistral_converter._is_weak_page(text) is True
 
+    def test_blank_lines_ignored_in_average_line_length(self, monkeypatch):
+        monkeypatch.setattr(config, "OCR_MIN_TEXT_LENGTH", 5)
+        monkeypatch.setattr(config, "OCR_MIN_UNIQUENESS_RATIO", 0.0)
+        monkeypatch.setattr(config, "OCR_MAX_PHRASE_REPETITIONS", 100)
+        monkeypatch.setattr(config, "OCR_MIN_AVG_LINE_LENGTH", 20)
+
+        # Two 30-char lines padded with blank and whitespace-only lines
+        line = "x" * 30
+        text = f"\n\n  {line}  \n \t \n\n{line}\n\n\n"
+        assert mistral_converter._is_weak_page(text) is False
+
 
 # ============================================================================
 # improve_weak_pages - remaining paths
@@ -5387,6 +6052,7 @@ class TestBuildMistralOcrCacheContractMetadata:
             "extract_footer",
             "image_limit",
             "image_min_size",
+            "ocr_chunk_pages",
             "structured_output_enabled",
             "bbox_annotation_enabled",
             "document_annotation_enabled",
@@ -5438,6 +6104,24 @@ class TestDetectWeakPages:
         assert 2 in weak  # empty is weak
         assert 3 not in weak  # long diverse text is not weak
 
+    def test_improve_weak_pages_uses_precomputed_indices(self):
+        ocr_result = {"pages": [{"text": "short"}, {"text": "tiny"}]}
+
+        with patch.object(mistral_converter, "_detect_weak_pages") as mock_detect:
+            with patch.object(mistral_converter, "upload_file_for_ocr", return_value="https://signed.url"):
+                with patch.object(
+                    mistral_converter, "process_with_ocr", return_value=(False, None, "fail")
+                ) as mock_ocr:
+                    mistral_converter.improve_weak_pages(
+                        MagicMock(), Path("doc.pdf"), ocr_result, "model", weak_pages=[1]
+                    )
+
+        mock_detect.assert_not_called()
+        assert mock_ocr.call_count == 1
+        assert mock_ocr.call_args[1]["pages"] == [1]
+        # Only page text is used, so image base64 is never requested
+        assert mock_ocr.call_args[1]["include_image_base64"] is False
+
 
 class TestIsForbiddenAddress:
     """_is_forbidden_address with various IP types."""
@@ -498,6 +498,22 @@ class TestProcessFilesConcurrently:
         assert success == 0
         assert failed == 1
 
+    def test_exception_logged_with_type_and_debug_traceback(self, tmp_path, caplog):
+        f = tmp_path / "test.txt"
+        f.write_text("data")
+
+        def raise_fn(p):
+            raise RuntimeError("boom")
+
+        with caplog.at_level("DEBUG", logger=main.logger.name):
+            main._process_files_concurrently([f], raise_fn)
+
+        errors = [r for r in caplog.records if r.levelname == "ERROR"]
+        assert "RuntimeError: boom" in errors[0].getMessage()
+        assert errors[0].exc_info is None
+        debug_records = [r for r in caplog.records if r.levelname == "DEBUG" and r.exc_info]
+        assert debug_records and debug_records[0].exc_info[0] is RuntimeError
+
     def test_multiple_files_concurrent(self, tmp_path, monkeypatch):
         monkeypatch.setattr(config, "MAX_CONCURRENT_FILES", 2)
         files = []
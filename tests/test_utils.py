@@ -5,6 +5,8 @@ Tests for utils.py module
 import concurrent.futures
 import json
 import logging
+import os
+import time
 import unittest.mock
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -133,6 +135,115 @@ class TestIntelligentCache:
 
         assert len(cache._hash_memo) <= cache._hash_memo_max_entries
 
+    def test_file_hash_matches_sha256_across_chunks(self, tmp_path, monkeypatch):
+        import hashlib
+
+        monkeypatch.setattr(utils, "_blake3", None)
+        cache = utils.IntelligentCache(cache_dir=tmp_path)
+        data = os.urandom(utils._HASH_CHUNK_SIZE * 2 + 123)
+        f = tmp_path / "big.bin"
+        f.write_bytes(data)
+
+        assert cache._get_file_hash(f) == hashlib.sha256(data).hexdigest()
+
+    def test_file_hash_uses_blake3_when_available(self, tmp_path, monkeypatch):
+        import hashlib
+
+        monkeypatch.setattr(utils, "_blake3", lambda: hashlib.blake2b(digest_size=32))
+        cache = utils.IntelligentCache(cache_dir=tmp_path)
+        f = tmp_path / "doc.pdf"
+        f.write_bytes(b"%PDF-1.4 content")
+
+        assert cache._get_file_hash(f) == "b3-" + hashlib.blake2b(b"%PDF-1.4 content", digest_size=32).hexdigest()
+
+    def test_hash_index_reused_by_new_instance(self, tmp_path, monkeypatch):
+        cache_dir = tmp_path / "cache"
+        f = tmp_path / "doc.pdf"
+        f.write_bytes(b"%PDF-1.4 content")
+        settled = time.time() - 60
+        os.utime(f, (settled, settled))
+        cache = utils.IntelligentCache(cache_dir=cache_dir)
+        file_hash = cache._get_file_hash(f)
+        cache.flush_hash_index()
+
+        # A later run finds the hash by (path, mtime, size, inode, ctime) without opening the file
+        monkeypatch.setattr("builtins.open", unittest.mock.Mock(side_effect=AssertionError("file re-read")))
+        assert utils.IntelligentCache(cache_dir=cache_dir)._get_file_hash(f) == file_hash
+
+    def test_hash_index_misses_file_replaced_with_mtime_preserved(self, tmp_path):
+        cache_dir = tmp_path / "cache"
+        f = tmp_path / "doc.pdf"
+        f.write_bytes(b"%PDF-1.4 old")
+        settled = time.time() - 60
+        os.utime(f, ns=(int(settled * 1e9), int(settled * 1e9)))
+        cache = utils.IntelligentCache(cache_dir=cache_dir)
+        old_hash = cache._get_file_hash(f)
+        cache.flush_hash_index()
+
+        # Same size and mtime, different bytes, as after ``cp -p`` over the original
+        replacement = tmp_path / "new.pdf"
+        replacement.write_bytes(b"%PDF-1.4 new")
+        os.utime(replacement, ns=(int(settled * 1e9), int(settled * 1e9)))
+        os.replace(replacement, f)
+
+        assert utils.IntelligentCache(cache_dir=cache_dir)._get_file_hash(f) != old_hash
+
+    def test_hash_index_written_once_per_flush(self, tmp_path, monkeypatch):
+        cache_dir = tmp_path / "cache"
+        cache = utils.IntelligentCache(cache_dir=cache_dir)
+        settled = time.time() - 60
+        for i in range(3):
+            f = tmp_path / f"doc{i}.pdf"
+            f.write_bytes(b"content %d" % i)
+            os.utime(f, (settled, settled))
+            cache._get_file_hash(f)
+        writes = []
+        monkeypatch.setattr(utils, "atomic_write_binary", lambda path, data: writes.append(path))
+
+        cache.flush_hash_index()
+        cache.flush_hash_index()
+
+        assert writes == [cache_dir / utils._HASH_INDEX_FILENAME]
+
+    def test_hash_index_skips_recently_modified_files(self, tmp_path):
+        cache_dir = tmp_path / "cache"
+        f = tmp_path / "doc.pdf"
+        f.write_bytes(b"%PDF-1.4 content")
+        cache = utils.IntelligentCache(cache_dir=cache_dir)
+        cache._get_file_hash(f)
+        cache.flush_hash_index()
+
+        assert not (cache_dir / utils._HASH_INDEX_FILENAME).exists()
+
+    def test_unreadable_hash_index_ignored(self, tmp_path):
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+        (cache_dir / utils._HASH_INDEX_FILENAME).write_text("not json")
+        f = tmp_path / "doc.pdf"
+        f.write_bytes(b"%PDF-1.4 content")
+
+        cache = utils.IntelligentCache(cache_dir=cache_dir)
+        assert cache._get_file_hash(f)
+        assert cache.get_statistics()["total_entries"] == 0
+
+    def test_cache_set_stats_source_once(self, tmp_path, monkeypatch):
+        cache = utils.IntelligentCache(cache_dir=tmp_path / "cache")
+        test_file = tmp_path / "doc.txt"
+        test_file.write_text("content")
+        calls = []
+        original_stat = utils.Path.stat
+
+        def counting_stat(self, *args, **kwargs):
+            if self == test_file:
+                calls.append(self)
+            return original_stat(self, *args, **kwargs)
+
+        monkeypatch.setattr(utils.Path, "stat", counting_stat)
+        cache.set(test_file, {"k": "v"}, cache_type="test")
+
+        assert len(calls) == 1
+        assert cache.get_entry(test_file, cache_type="test")["file_size"] == len("content")
+
     def test_cache_set_atomic_under_concurrency(self, tmp_path):
         """Concurrent writes to same cache key should not produce corrupt JSON."""
         cache = utils.IntelligentCache(cache_dir=tmp_path)
@@ -152,6 +263,32 @@ class TestIntelligentCache:
         assert parsed.get("type") == "test"
         assert "data" in parsed
 
+    def test_cache_reads_legacy_indented_entries(self, tmp_path):
+        """Entries written by older versions (indent=2 JSON) remain cache hits."""
+        cache = utils.IntelligentCache(cache_dir=tmp_path / "cache")
+        test_file = tmp_path / "doc.txt"
+        test_file.write_text("content")
+        cache.set(test_file, {"k": "v"}, cache_type="test")
+
+        cache_path = cache._get_cache_path(cache._get_file_hash(test_file), "test")
+        assert b"\n" not in cache_path.read_bytes()
+        entry = json.loads(cache_path.read_text(encoding="utf-8"))
+        cache_path.write_text(json.dumps(entry, indent=2), encoding="utf-8")
+
+        assert cache.get(test_file, cache_type="test") == {"k": "v"}
+
+    def test_cache_set_failure_leaves_no_temp_files(self, tmp_path):
+        """A failed cache write must not leave orphaned temp files behind."""
+        cache_dir = tmp_path / "cache"
+        cache = utils.IntelligentCache(cache_dir=cache_dir)
+        test_file = tmp_path / "doc.txt"
+        test_file.write_text("content")
+
+        with unittest.mock.patch("pathlib.Path.replace", side_effect=OSError("rename failed")):
+            cache.set(test_file, {"k": "v"}, cache_type="test")
+
+        assert list(cache_dir.iterdir()) == []
+
 
 class TestMarkdownFormatting:
     """Test markdown formatting functions."""
@@ -201,6 +338,10 @@ class TestTextCleaning:
         result = utils.clean_consecutive_duplicates(text)
         assert result == text
 
+    def test_clean_consecutive_duplicates_no_duplicates_normalizes_line_endings(self):
+        """The no-duplicate fast path still normalizes endings like the groupby path."""
+        assert utils.clean_consecutive_duplicates("Line 1\r\nLine 2\r\n") == "Line 1\nLine 2"
+
     def test_clean_consecutive_duplicates_empty(self):
         """Test with empty string."""
         result = utils.clean_consecutive_duplicates("")
@@ -315,6 +456,32 @@ class TestFileValidation:
         assert ok is False
         assert err and "too large" in err.lower()
 
+    def test_validate_file_stats_file_once(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "INPUT_DIR", tmp_path)
+        test_file = tmp_path / "doc.pdf"
+        test_file.write_bytes(b"%PDF-1.4")
+        calls = []
+        original_stat = utils.Path.stat
+
+        def counting_stat(self, *args, **kwargs):
+            if self == test_file:
+                calls.append(self)
+            return original_stat(self, *args, **kwargs)
+
+        monkeypatch.setattr(utils.Path, "stat", counting_stat)
+
+        assert utils.validate_file(test_file) == (True, None)
+        assert len(calls) == 1
+
+    @pytest.mark.parametrize("name, expected", [("a.md_only", True), ("a.ocr_only", True), ("a.neither", False)])
+    def test_validate_file_smart_accepts_either_engine(self, tmp_path, monkeypatch, name, expected):
+        monkeypatch.setattr(config, "MARKITDOWN_SUPPORTED", {"md_only"})
+        monkeypatch.setattr(config, "MISTRAL_OCR_SUPPORTED", {"ocr_only"})
+        test_file = tmp_path / name
+        test_file.write_text("content")
+        ok, _ = utils.validate_file(test_file, mode="smart")
+        assert ok is expected
+
     def test_validate_file_qna_accepts_mistral_extensions_only(self, tmp_path):
         pdf = tmp_path / "a.pdf"
         pdf.write_bytes(b"%PDF")
@@ -393,6 +560,53 @@ class TestAtomicWriteText:
         utils.atomic_write_text(dest, "complete")
         assert dest.read_text(encoding="utf-8") == "complete"
 
+    def test_atomic_write_text_accepts_iterable_pieces(self, tmp_path):
+        dest = tmp_path / "out.md"
+        utils.atomic_write_text(dest, (piece for piece in ["# Title\n", "body ", "text\n"]))
+        assert dest.read_text(encoding="utf-8") == "# Title\nbody text\n"
+
+    def test_atomic_write_text_failing_iterable_keeps_destination(self, tmp_path):
+        dest = tmp_path / "out.md"
+        dest.write_text("old", encoding="utf-8")
+
+        def _pieces():
+            yield "partial"
+            raise RuntimeError("render failed")
+
+        with pytest.raises(RuntimeError):
+            utils.atomic_write_text(dest, _pieces())
+        assert dest.read_text(encoding="utf-8") == "old"
+        assert list(tmp_path.iterdir()) == [dest]
+
+
+class TestJsonHelpers:
+    """json_dumps_bytes / json_loads work with and without orjson."""
+
+    PAYLOAD = {"text": 'café "quoted"', "pages": [{"n": 1, "ok": True, "v": None}], "big": 2**70}
+
+    def test_round_trip(self):
+        data = utils.json_dumps_bytes(self.PAYLOAD)
+        assert isinstance(data, bytes)
+        assert utils.json_loads(data) == self.PAYLOAD
+        assert utils.json_loads(data.decode("utf-8")) == self.PAYLOAD
+
+    def test_stdlib_fallback_matches_json_dumps(self, monkeypatch):
+        monkeypatch.setattr(utils, "orjson", None)
+        data = utils.json_dumps_bytes(self.PAYLOAD)
+        assert data == json.dumps(self.PAYLOAD, indent=2, ensure_ascii=False).encode("utf-8")
+        assert utils.json_loads(data) == self.PAYLOAD
+
+    def test_compact_output(self, monkeypatch):
+        assert b"\n" not in utils.json_dumps_bytes(self.PAYLOAD, indent=False)
+        monkeypatch.setattr(utils, "orjson", None)
+        compact = utils.json_dumps_bytes(self.PAYLOAD, indent=False)
+        assert b"\n" not in compact
+        assert utils.json_loads(compact) == self.PAYLOAD
+
+    def test_malformed_input_raises_json_decode_error(self):
+        with pytest.raises(json.JSONDecodeError):
+            utils.json_loads(b"{not json")
+
 
 class TestPdfExceedsHeavyWorkLimit:
     """pdf_exceeds_heavy_work_limit stat gate for PDF pipelines."""
@@ -459,6 +673,26 @@ class TestYAMLFrontmatter:
 
         assert 'title: "Report \\"2026\\""' in result
 
+    @pytest.mark.parametrize("value", ['Bilan "2026" – été', "line\nbreak\ttab", "back\\slash", "\ud800"])
+    def test_yaml_scalar_matches_json_dumps(self, value):
+        assert utils._yaml_scalar(value) == json.dumps(value, ensure_ascii=False)
+
+    def test_generate_yaml_frontmatter_override_keeps_field_order(self):
+        """Extras that override a base field replace it in place rather than appending."""
+        result = utils.generate_yaml_frontmatter(
+            title="Base",
+            file_name="test.pdf",
+            conversion_method="Method",
+            additional_fields={"title": "Override", "page_count": 2},
+        )
+
+        lines = result.splitlines()
+        assert lines[0] == "---"
+        assert lines[1] == 'title: "Override"'
+        assert lines[-2] == "page_count: 2"
+        assert lines[-1] == "---"
+        assert result.count("title:") == 1
+
     def test_strip_yaml_frontmatter(self):
         """Test frontmatter removal."""
         content = """---
@@ -543,6 +777,20 @@ class TestClearOldEntries:
         assert removed == 0
         assert cache_file.exists()
 
+    def test_stale_mtime_removed_without_reading(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "CACHE_DURATION_HOURS", 1)
+        cache = utils.IntelligentCache(cache_dir=tmp_path)
+        cache_file = tmp_path / "stale_entry.json"
+        cache_file.write_text(json.dumps({"timestamp": datetime.now().isoformat(), "type": "ocr", "data": {}}))
+        stale = time.time() - 5 * 3600
+        os.utime(cache_file, (stale, stale))
+
+        with unittest.mock.patch.object(utils, "json_loads", side_effect=AssertionError("payload read")):
+            removed = cache.clear_old_entries()
+
+        assert removed == 1
+        assert not cache_file.exists()
+
     def test_clear_old_entries_corrupt_file(self, tmp_path):
         """Lines 317-318: exception handler when processing cache file fails."""
         cache = utils.IntelligentCache(cache_dir=tmp_path)
@@ -567,6 +815,10 @@ class TestDetectMonthHeaderRow:
         table = [["Name", "Value"], ["A", "1"]]
         assert utils.detect_month_header_row(table) is None
 
+    def test_requires_three_month_names(self):
+        table = [["Beginning", "January"], ["", "Current", "May", None, "June"]]
+        assert utils.detect_month_header_row(table) == 1
+
     def test_empty_table_returns_none(self):
         assert utils.detect_month_header_row([]) is None
 
@@ -580,6 +832,9 @@ class TestCleanTableCell:
     def test_collapses_whitespace(self):
         assert utils.clean_table_cell("  too   many   spaces  ") == "too many spaces"
 
+    def test_mixed_line_breaks_and_tabs(self):
+        assert utils.clean_table_cell("\r\n Acct\r\n\tAccount  Title \n") == "Acct Account Title"
+
     def test_empty_string(self):
         assert utils.clean_table_cell("") == ""
 
@@ -599,6 +854,13 @@ class TestIsPageArtifactRow:
     def test_date_is_artifact(self):
         assert utils.is_page_artifact_row(["December 31, 2010"]) is True
 
+    @pytest.mark.parametrize(
+        "row, expected",
+        [(["May 1, 2024"], True), (["Current", "30 2023"], True), (["Invoice 12, 2024"], False)],
+    )
+    def test_date_row_needs_month_header(self, row, expected):
+        assert utils.is_page_artifact_row(row) is expected
+
     def test_empty_row_is_artifact(self):
         assert utils.is_page_artifact_row(["", ""]) is True
 
@@ -706,6 +968,23 @@ class TestFileCacheExpiredEntry:
         assert result is None
         assert cache.misses == 1
 
+    def test_stale_mtime_rejected_without_parsing(self, tmp_path, monkeypatch):
+        cache = utils.IntelligentCache(cache_dir=tmp_path)
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("content")
+
+        cache.set(test_file, {"data": "value"}, cache_type="test")
+        cache_path = cache._get_cache_path(cache._get_file_hash(test_file), "test")
+        old = time.time() - (config.CACHE_DURATION_HOURS + 1) * 3600
+        os.utime(cache_path, (old, old))
+
+        loads = unittest.mock.MagicMock(side_effect=AssertionError("stale entry should not be parsed"))
+        monkeypatch.setattr(utils, "json_loads", loads)
+
+        assert cache.get(test_file, cache_type="test") is None
+        assert not cache_path.exists()
+        assert cache.misses == 1
+
 
 class TestFileCacheTypeMismatchSamePath:
     """Lines 215-218: FileCache.get() type mismatch with old-style (non-segregated) cache files."""
@@ -9,21 +9,36 @@ Documentation references:
 - Mistral OCR: https://docs.mistral.ai/capabilities/document_ai/basic_ocr/
 """
 
+import atexit
 import hashlib
 import itertools
 import json
 import logging
+import operator
+import os
 import re
+import stat as stat_module
 import sys
 import tempfile
 import threading
+import time
 from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
 
 import config
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:  # pragma: no cover - optional speedup
+    _blake3 = None
+
 
 class ConversionResult(NamedTuple):
     """Standardised return type for all converter functions."""
@@ -38,6 +53,9 @@ __all__ = [
     "IntelligentCache",
     "atomic_write_text",
     "atomic_write_binary",
+    "atomic_write_chunks",
+    "json_dumps_bytes",
+    "json_loads",
     "format_table_to_markdown",
     "detect_month_header_row",
     "clean_table_cell",
@@ -136,7 +154,9 @@ def ui_print(*args, **kwargs) -> None:
     print(*args, **kwargs)
 
 
-def atomic_write_text(path: Path, content: str, encoding: str = "utf-8", newline: Optional[str] = None) -> None:
+def atomic_write_text(
+    path: Path, content: Union[str, Iterable[str]], encoding: str = "utf-8", newline: Optional[str] = None
+) -> None:
     """Write *content* to *path* atomically via a temporary file and rename.
 
     This prevents partial / corrupt files when the process is interrupted
@@ -146,7 +166,8 @@ def atomic_write_text(path: Path, content: str, encoding: str = "utf-8", newline
 
     Args:
         path: Destination file path.
-        content: Text to write.
+        content: Text to write, or an iterable of text pieces written in
+            order (avoids joining a large document into one string first).
         encoding: File encoding (default ``"utf-8"``).
         newline: Newline translation mode passed to the underlying
             ``open()`` call.  Pass ``""`` when writing content that
@@ -165,8 +186,11 @@ def atomic_write_text(path: Path, content: str, encoding: str = "utf-8", newline
             suffix=".tmp",
             delete=False,
         ) as tmp_file:
-            tmp_file.write(content)
             tmp_path = Path(tmp_file.name)
+            if isinstance(content, str):
+                tmp_file.write(content)
+            else:
+                tmp_file.writelines(content)
         tmp_path.replace(path)
     except BaseException:
         if tmp_path is not None:
@@ -183,6 +207,17 @@ def atomic_write_binary(path: Path, data: bytes) -> None:
     Binary counterpart of :func:`atomic_write_text`.  Prevents partial /
     corrupt files when the process is interrupted mid-write.
     """
+    atomic_write_chunks(path, (data,))
+
+
+def atomic_write_chunks(path: Path, chunks: Iterable[bytes]) -> None:
+    """Atomically write the concatenation of *chunks* to *path*.
+
+    Like :func:`atomic_write_binary`, but consumes an iterable so large
+    payloads can be produced and written piecewise without materialising
+    the whole file in memory.  If producing a chunk raises, the temporary
+    file is removed and *path* is left untouched.
+    """
     tmp_path = None
     try:
         with tempfile.NamedTemporaryFile(
@@ -191,8 +226,9 @@ def atomic_write_binary(path: Path, data: bytes) -> None:
             suffix=".tmp",
             delete=False,
         ) as tmp_file:
-            tmp_file.write(data)
             tmp_path = Path(tmp_file.name)
+            for chunk in chunks:
+                tmp_file.write(chunk)
         tmp_path.replace(path)
     except BaseException:
         if tmp_path is not None:
@@ -203,11 +239,55 @@ def atomic_write_binary(path: Path, data: bytes) -> None:
         raise
 
 
+def json_dumps_bytes(obj: Any, indent: bool = True) -> bytes:
+    """Serialize *obj* as UTF-8 JSON bytes.
+
+    Uses ``orjson`` when installed (much faster on multi-MB OCR payloads with
+    base64 image data) and falls back to the stdlib otherwise.  Output matches
+    ``json.dumps(obj, indent=2, ensure_ascii=False)`` apart from float
+    formatting details; ``indent=False`` emits compact JSON for machine-only
+    files such as cache entries.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            # e.g. integers beyond 64 bits -- let the stdlib handle (or reject) it
+            pass
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_loads(data: Any) -> Any:
+    """Parse JSON from ``bytes`` or ``str``, preferring ``orjson`` when installed.
+
+    Raises ``json.JSONDecodeError`` (``orjson.JSONDecodeError`` subclasses it)
+    on malformed input.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 # ============================================================================
 # Intelligent Caching System
 # ============================================================================
 
 
+_HASH_CHUNK_SIZE = 256 * 1024
+# Persisted (path, mtime_ns, size, inode, ctime_ns) -> content hash memo, so a
+# re-run of the pipeline can look up cached results without re-reading every
+# input file. Inode and ctime catch files replaced with their mtime preserved
+# (``cp -p``, ``rsync -t``, tar extracts): neither can be set by the copier.
+# Not *.json, so cache sweeps and statistics never treat it as an entry.
+_HASH_INDEX_FILENAME = "file_hashes.idx"
+# Files modified this recently may still change without their mtime moving
+# (coarse filesystem timestamps); their hashes are only memoized in memory.
+_HASH_INDEX_MIN_AGE_SECONDS = 2.0
+
+
 class IntelligentCache:
     """
     Hash-based caching system for OCR results to avoid reprocessing.
@@ -228,15 +308,50 @@ class IntelligentCache:
         self._lock = threading.RLock()
         self.hits = 0
         self.misses = 0
-        # In-memory hash cache keyed by (path, mtime_ns, size) to avoid
-        # re-reading file contents on every cache lookup.
+        # In-memory hash cache keyed by (path, mtime_ns, size, inode, ctime_ns)
+        # to avoid re-reading file contents on every cache lookup.
         # Keep this bounded to avoid unbounded growth in long-running processes.
-        self._hash_memo: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._hash_memo: "OrderedDict[Tuple[str, int, int, int, int], str]" = OrderedDict()
         self._hash_memo_max_entries = 1000
+        self._hash_index_path = self.cache_dir / _HASH_INDEX_FILENAME
+        self._hash_index_loaded = False
+        self._hash_index_dirty = False
+
+    def _load_hash_index(self) -> None:
+        """Seed the hash memo from the on-disk index (once; caller holds the lock)."""
+        self._hash_index_loaded = True
+        try:
+            rows = json_loads(self._hash_index_path.read_bytes())
+            for path_str, mtime_ns, size, ino, ctime_ns, file_hash in rows[-self._hash_memo_max_entries :]:
+                key = (str(path_str), int(mtime_ns), int(size), int(ino), int(ctime_ns))
+                self._hash_memo[key] = str(file_hash)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.debug("Ignoring unreadable hash index %s: %s", self._hash_index_path.name, e)
+
+    def flush_hash_index(self) -> None:
+        """
+        Persist the hash memo if it changed (best effort: a lost index only costs re-hashing).
+
+        Called once at interpreter exit for the global cache rather than after
+        every hashed file, so a batch rewrites the index once.
+        """
+        settled_ns = time.time_ns() - int(_HASH_INDEX_MIN_AGE_SECONDS * 1e9)
+        with self._lock:
+            if not self._hash_index_dirty:
+                return
+            rows = [[*key, file_hash] for key, file_hash in self._hash_memo.items() if key[1] <= settled_ns]
+            try:
+                if rows:
+                    atomic_write_binary(self._hash_index_path, json_dumps_bytes(rows, indent=False))
+                self._hash_index_dirty = False
+            except OSError as e:
+                logger.debug("Could not save hash index: %s", e)
 
-    def _get_file_hash(self, file_path: Path) -> str:
+    def _get_file_hash(self, file_path: Path, stat: Optional[os.stat_result] = None) -> str:
         """
-        Generate SHA-256 hash of file contents.
+        Generate a content hash of the file (BLAKE3 when installed, else SHA-256).
 
         The cache key is content-based by design: two files with identical
         bytes produce the same hash and share cached results.  This is
@@ -244,37 +359,54 @@ class IntelligentCache:
         given input.  Cache *type* segregation (``_get_cache_path``)
         prevents cross-type collisions.
 
-        Results are memoized by (path, mtime_ns, size) so repeated lookups
-        for the same unchanged file avoid re-reading the entire file.
+        Results are memoized by (path, mtime_ns, size, inode, ctime_ns), in
+        memory and in an index file under the cache directory (written by
+        ``flush_hash_index``), so lookups for an unchanged file avoid
+        re-reading it -- also across runs.
 
         Args:
             file_path: Path to file
+            stat: ``file_path.stat()`` if the caller already has it
 
         Returns:
             Hexadecimal hash string
         """
-        stat = file_path.stat()
-        memo_key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+        if stat is None:
+            stat = file_path.stat()
+        memo_key = (str(file_path), stat.st_mtime_ns, stat.st_size, stat.st_ino, stat.st_ctime_ns)
 
         with self._lock:
+            if not self._hash_index_loaded:
+                self._load_hash_index()
             cached_hash = self._hash_memo.get(memo_key)
             if cached_hash is not None:
                 # LRU refresh
                 self._hash_memo.move_to_end(memo_key)
                 return cached_hash
 
-        hasher = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            # Read in larger chunks for better throughput on modern disks (64KB)
-            for chunk in iter(lambda: f.read(65536), b""):
-                hasher.update(chunk)
-        file_hash = hasher.hexdigest()
+        # Cache keys only need to be content-addressed, not cryptographic:
+        # use SIMD BLAKE3 when installed (several times SHA-256's throughput on
+        # large PDFs). Its digests are prefixed so entries from either hasher
+        # can never be confused with each other.
+        hasher: Any = _blake3() if _blake3 is not None else hashlib.sha256()
+        # readinto() one reused buffer (unbuffered file) so hashing a large PDF
+        # allocates no per-chunk bytes objects and never holds more than a chunk.
+        buf = bytearray(_HASH_CHUNK_SIZE)
+        view = memoryview(buf)
+        with open(file_path, "rb", buffering=0) as f:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                hasher.update(view[:n])
+        file_hash = hasher.hexdigest() if _blake3 is None else f"b3-{hasher.hexdigest()}"
 
         with self._lock:
             self._hash_memo[memo_key] = file_hash
             self._hash_memo.move_to_end(memo_key)
             while len(self._hash_memo) > self._hash_memo_max_entries:
                 self._hash_memo.popitem(last=False)
+            self._hash_index_dirty = True
         return file_hash
 
     def _get_cache_path(self, file_hash: str, cache_type: str = "ocr") -> Path:
@@ -282,7 +414,7 @@ class IntelligentCache:
         Get cache file path for a given hash and type.
 
         Args:
-            file_hash: SHA-256 hash of file contents
+            file_hash: Content hash from ``_get_file_hash``
             cache_type: Type of cache (e.g., "ocr", "mistral_ocr", "table")
 
         Returns:
@@ -300,23 +432,39 @@ class IntelligentCache:
         """
         cache_path: Optional[Path] = None
         try:
-            if not file_path.exists():
+            try:
+                # _get_file_hash stats the source file anyway; a missing file
+                # surfaces here instead of via a separate exists() probe.
+                file_hash = self._get_file_hash(file_path)
+            except FileNotFoundError:
                 logger.debug("Cache lookup skipped (file missing): %s", file_path)
                 with self._lock:
                     self.misses += 1
                 return None
 
-            file_hash = self._get_file_hash(file_path)
             cache_path = self._get_cache_path(file_hash, cache_type)
+            max_age = timedelta(hours=config.CACHE_DURATION_HOURS)
 
             with self._lock:
-                if not cache_path.exists():
+                # One stat answers both "is there an entry?" and "is it stale?".
+                # The stored timestamp is taken before the file is written, so an
+                # mtime past max_age means the entry is expired and the (possibly
+                # large) payload need not be read or parsed.
+                try:
+                    cache_stat = os.stat(cache_path)
+                except FileNotFoundError:
+                    self.misses += 1
+                    return None
+
+                if time.time() - cache_stat.st_mtime > max_age.total_seconds():
+                    logger.debug("Cache expired for %s", file_path.name)
+                    cache_path.unlink(missing_ok=True)
                     self.misses += 1
                     return None
 
                 try:
-                    with open(cache_path, "r", encoding="utf-8") as f:
-                        cache_data = json.load(f)
+                    with open(cache_path, "rb") as f:
+                        cache_data = json_loads(f.read())
                 except FileNotFoundError:
                     self.misses += 1
                     return None
@@ -330,7 +478,6 @@ class IntelligentCache:
                 cached_time = datetime.fromisoformat(cache_data.get("timestamp", ""))
                 if cached_time.tzinfo is None:
                     cached_time = cached_time.replace(tzinfo=timezone.utc)
-                max_age = timedelta(hours=config.CACHE_DURATION_HOURS)
 
                 if datetime.now(timezone.utc) - cached_time > max_age:
                     logger.debug("Cache expired for %s", file_path.name)
@@ -405,41 +552,35 @@ class IntelligentCache:
             metadata: Optional metadata to store
         """
         try:
-            if not file_path.exists():
+            # One stat serves the existence check, the hash memo key and file_size
+            try:
+                stat = file_path.stat()
+            except FileNotFoundError:
                 logger.warning("Cannot cache missing file: %s", file_path)
                 return
 
-            file_hash = self._get_file_hash(file_path)
+            file_hash = self._get_file_hash(file_path, stat)
             # Use type-segregated cache path to avoid collisions
             cache_path = self._get_cache_path(file_hash, cache_type)
 
             cache_entry = {
                 "timestamp": datetime.now(timezone.utc).isoformat(),
                 "file_name": file_path.name,
-                "file_size": file_path.stat().st_size,
+                "file_size": stat.st_size,
                 "type": cache_type,
                 "data": data,
                 "metadata": metadata or {},
             }
 
-            # Atomic write to avoid partial/corrupt cache files under concurrency.
-            # os.replace/Path.replace is atomic on the same filesystem.
-            with tempfile.NamedTemporaryFile(
-                mode="w",
-                encoding="utf-8",
-                dir=str(self.cache_dir),
-                suffix=".tmp",
-                delete=False,
-            ) as tmp_file:
-                json.dump(cache_entry, tmp_file, indent=2, ensure_ascii=False)
-                temp_path = Path(tmp_file.name)
-
-            temp_path.replace(cache_path)
+            # Serialize first so an unserializable payload never touches disk, then
+            # write atomically (temp file + replace; temp removed on failure) to
+            # avoid partial/corrupt cache files under concurrency.
+            # Compact JSON: cache files are machine-read only and OCR payloads are
+            # large, so indentation mostly costs bytes written and parsed.
+            atomic_write_binary(cache_path, json_dumps_bytes(cache_entry, indent=False))
 
             # Restrict permissions on cache files (may contain sensitive OCR text)
             if sys.platform != "win32":  # pragma: no cover
-                import os
-
                 try:
                     os.chmod(cache_path, 0o600)
                 except OSError:
@@ -459,18 +600,28 @@ class IntelligentCache:
         """
         removed = 0
         max_age = timedelta(hours=config.CACHE_DURATION_HOURS)
+        # One clock read for the whole sweep
+        now = datetime.now(timezone.utc)
+        mtime_cutoff = now.timestamp() - max_age.total_seconds()
 
         with self._lock:
             for cache_file in self.cache_dir.glob("*.json"):
                 try:
-                    with open(cache_file, "r", encoding="utf-8") as f:
-                        cache_data = json.load(f)
+                    # As in get(): an entry last written before the cutoff is
+                    # expired, so its payload need not be read or parsed.
+                    if cache_file.stat().st_mtime < mtime_cutoff:
+                        cache_file.unlink()
+                        removed += 1
+                        continue
+
+                    with open(cache_file, "rb") as f:
+                        cache_data = json_loads(f.read())
 
                     cached_time = datetime.fromisoformat(cache_data.get("timestamp", ""))
                     if cached_time.tzinfo is None:
                         cached_time = cached_time.replace(tzinfo=timezone.utc)
 
-                    if datetime.now(timezone.utc) - cached_time > max_age:
+                    if now - cached_time > max_age:
                         cache_file.unlink()
                         removed += 1
 
@@ -506,6 +657,7 @@ class IntelligentCache:
 
 # Global cache instance
 cache = IntelligentCache()
+atexit.register(cache.flush_hash_index)
 
 # ============================================================================
 # Markdown Table Formatting
@@ -534,20 +686,21 @@ def format_table_to_markdown(data: List[List[str]], headers: Optional[List[str]]
     if not headers:
         return ""
 
-    # Build markdown table
-    lines = []
-
-    # Header row
-    lines.append("| " + " | ".join(str(h) for h in headers) + " |")
-
-    # Separator row
-    lines.append("| " + " | ".join("---" for _ in headers) + " |")
+    # Build markdown table: rows are collected and joined once
+    width = len(headers)
+    lines = [
+        # Header row
+        "| " + " | ".join(map(str, headers)) + " |",
+        # Separator row
+        "| " + " | ".join(["---"] * width) + " |",
+    ]
 
-    # Data rows
+    # Data rows (truncate to the header width; pad short rows only)
     for row in data:
-        # Pad row to match header length
-        padded_row = list(row) + [""] * (len(headers) - len(row))
-        lines.append("| " + " | ".join(str(cell) for cell in padded_row[: len(headers)]) + " |")
+        cells = list(map(str, row[:width]))
+        if len(cells) < width:
+            cells.extend([""] * (width - len(cells)))
+        lines.append("| " + " | ".join(cells) + " |")
 
     return "\n".join(lines)
 
@@ -590,13 +743,11 @@ def detect_month_header_row(table: List[List[str]]) -> Optional[int]:
 
     for row_idx, row in enumerate(table):
         # Join all cells in the row
-        row_text = " ".join(str(cell or "") for cell in row).strip()
+        row_text = " ".join(str(cell or "") for cell in row)
 
-        # Check if this row contains multiple month names
-        month_count = sum(1 for month in MONTH_HEADERS if month in row_text)
-
-        # If we find at least 3 month names (or Beginning/Current), likely a header
-        if month_count >= 3:
+        # At least 3 month names (or Beginning/Current) marks a header row;
+        # stop scanning the month list as soon as the third one is found
+        if next(itertools.islice(filter(row_text.__contains__, MONTH_HEADERS), 2, None), None) is not None:
             return row_idx
 
     return None
@@ -619,13 +770,16 @@ def clean_table_cell(cell: str) -> str:
     if not cell:
         return ""
 
-    # Replace newlines with spaces
-    cell = cell.replace("\n", " ").replace("\r", " ")
+    # One split() pass: newlines count as whitespace, runs collapse to a single
+    # space, and the join has no leading/trailing whitespace left to strip.
+    return " ".join(cell.split())
 
-    # Collapse multiple spaces
-    cell = " ".join(cell.split())
 
-    return cell.strip()
+# Page artifact patterns (compiled once; checked for every extracted table row)
+_PAGE_NUMBER_ROW_RE = re.compile(r"^Page\s+\d+$")
+_DATE_ROW_RE = re.compile(r"^[A-Za-z]+\s+\d{1,2},?\s+\d{4}$")
+# Any month header, in one pass instead of one substring scan per name
+_MONTH_HEADER_RE = re.compile("|".join(MONTH_HEADERS))
 
 
 def is_page_artifact_row(row: List[str]) -> bool:
@@ -650,19 +804,18 @@ def is_page_artifact_row(row: List[str]) -> bool:
     row_text = " ".join(str(cell or "") for cell in row).strip()
 
     # Check for page number artifacts (e.g., "Page 1", "Page 42", etc.)
-    if re.match(r"^Page\s+\d+$", row_text):
+    if _PAGE_NUMBER_ROW_RE.match(row_text):
         return True
 
     # Check if the row is just a date (e.g., "December 31, 2010")
     # Pattern: single cell or cells that form a date
-    if len(row_text) < 30 and any(month in row_text for month in MONTH_HEADERS):
+    if len(row_text) < 30 and _MONTH_HEADER_RE.search(row_text):
         # Check if it looks like "Month DD, YYYY"
-        date_pattern = r"^[A-Za-z]+\s+\d{1,2},?\s+\d{4}$"
-        if re.match(date_pattern, row_text.replace(",", "")):
+        if _DATE_ROW_RE.match(row_text.replace(",", "")):
             return True
 
-    # Empty or near-empty rows
-    if len(row_text.strip()) < 3:
+    # Empty or near-empty rows (row_text is already stripped)
+    if len(row_text) < 3:
         return True
 
     return False
@@ -694,8 +847,8 @@ def clean_table(table: List[List[str]]) -> List[List[str]]:
         # Clean each cell
         cleaned_row = [clean_table_cell(cell) for cell in row]
 
-        # Only add non-empty rows
-        if any(cell.strip() for cell in cleaned_row):
+        # Only add non-empty rows (cleaned cells are already stripped)
+        if any(cleaned_row):
             cleaned.append(cleaned_row)
 
     return cleaned
@@ -761,6 +914,11 @@ def clean_consecutive_duplicates(text: str) -> str:
     # Use splitlines() to handle different line endings correctly
     lines = text.splitlines()
 
+    # Most pages have no repeated neighbours: one C-level pairwise scan that
+    # stops at the first duplicate lets them skip the groupby rebuild.
+    if not any(map(operator.eq, lines, itertools.islice(lines, 1, None))):
+        return "\n".join(lines)
+
     # Use itertools.groupby to group consecutive identical lines.
     # The 'key' represents the unique line content for each group.
     # By taking only the key, we effectively collapse the group into one line.
@@ -770,6 +928,20 @@ def clean_consecutive_duplicates(text: str) -> str:
     return "\n".join(cleaned_lines)
 
 
+# Markdown patterns used by markdown_to_text (compiled once; it runs over whole
+# converted documents, and OCR output embeds one image link per extracted image).
+_MD_IMAGE_LINK_RE = re.compile(r"!\[.*?\]\(.*?\)")
+_MD_LINK_RE = re.compile(r"\[([^\]]+)\]\([^\)]+\)")
+_MD_HEADER_RE = re.compile(r"^#+\s+", re.MULTILINE)
+_MD_BOLD_STAR_RE = re.compile(r"\*\*([^\*]+)\*\*")
+_MD_ITALIC_STAR_RE = re.compile(r"\*([^\*]+)\*")
+_MD_BOLD_UNDERSCORE_RE = re.compile(r"__([^_]+)__")
+_MD_ITALIC_UNDERSCORE_RE = re.compile(r"_([^_]+)_")
+_MD_CODE_BLOCK_RE = re.compile(r"```[^\n]*\n.*?```", re.DOTALL)
+_MD_INLINE_CODE_RE = re.compile(r"`([^`]+)`")
+_EXCESS_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
 def markdown_to_text(markdown_content: str) -> str:
     """
     Convert Markdown to plain text by removing formatting.
@@ -783,26 +955,30 @@ def markdown_to_text(markdown_content: str) -> str:
     text = strip_yaml_frontmatter(markdown_content)
 
     # Remove images
-    text = re.sub(r"!\[.*?\]\(.*?\)", "", text)
+    text = _MD_IMAGE_LINK_RE.sub("", text)
 
     # Remove links but keep text
-    text = re.sub(r"\[([^\]]+)\]\([^\)]+\)", r"\1", text)
+    text = _MD_LINK_RE.sub(r"\1", text)
 
     # Remove headers #
-    text = re.sub(r"^#+\s+", "", text, flags=re.MULTILINE)
+    text = _MD_HEADER_RE.sub("", text)
 
-    # Remove bold/italic
-    text = re.sub(r"\*\*([^\*]+)\*\*", r"\1", text)
-    text = re.sub(r"\*([^\*]+)\*", r"\1", text)
-    text = re.sub(r"__([^_]+)__", r"\1", text)
-    text = re.sub(r"_([^_]+)_", r"\1", text)
+    # Remove bold/italic (the ``in`` checks skip whole-text scans when a
+    # marker never occurs, which is common for OCR output)
+    if "*" in text:
+        text = _MD_BOLD_STAR_RE.sub(r"\1", text)
+        text = _MD_ITALIC_STAR_RE.sub(r"\1", text)
+    if "_" in text:
+        text = _MD_BOLD_UNDERSCORE_RE.sub(r"\1", text)
+        text = _MD_ITALIC_UNDERSCORE_RE.sub(r"\1", text)
 
     # Remove code blocks
-    text = re.sub(r"```[^\n]*\n.*?```", "", text, flags=re.DOTALL)
-    text = re.sub(r"`([^`]+)`", r"\1", text)
+    if "`" in text:
+        text = _MD_CODE_BLOCK_RE.sub("", text)
+        text = _MD_INLINE_CODE_RE.sub(r"\1", text)
 
     # Clean up multiple blank lines
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _EXCESS_BLANK_LINES_RE.sub("\n\n", text)
 
     return text.strip()
 
@@ -959,39 +1135,40 @@ def validate_file(file_path: Path, mode: Optional[str] = None) -> Tuple[bool, Op
     Returns:
         Tuple of (is_valid, error_message)
     """
-    if not file_path.exists():
+    # One stat answers existence, file type and size (checked in this order)
+    try:
+        file_stat = file_path.stat()
+    except OSError:
         return False, f"File does not exist: {file_path}"
 
-    if not file_path.is_file():
+    if not stat_module.S_ISREG(file_stat.st_mode):
         return False, f"Not a file: {file_path}"
 
     ok_path, path_err = _resolved_path_under_input_dir(file_path)
     if not ok_path:
         return False, path_err
 
-    if file_path.stat().st_size == 0:
+    if file_stat.st_size == 0:
         return False, f"File is empty: {file_path.name}"
 
     # Check file extension against the correct set for the requested mode
     ext = file_path.suffix.lower().lstrip(".")
 
     if mode == "markitdown":
-        supported = config.MARKITDOWN_SUPPORTED
+        is_supported = ext in config.MARKITDOWN_SUPPORTED
     elif mode in ("mistral_ocr", "qna", "batch_ocr"):
-        supported = config.MISTRAL_OCR_SUPPORTED
+        is_supported = ext in config.MISTRAL_OCR_SUPPORTED
     elif mode == "pdf_to_images":
-        supported = config.PDF_EXTENSIONS
+        is_supported = ext in config.PDF_EXTENSIONS
     else:
-        # smart / None — union (routing picks engine per file)
-        supported = config.MARKITDOWN_SUPPORTED | config.MISTRAL_OCR_SUPPORTED
+        # smart / None — either engine (routing picks one per file); two
+        # lookups instead of building the union set for every file
+        is_supported = ext in config.MARKITDOWN_SUPPORTED or ext in config.MISTRAL_OCR_SUPPORTED
 
-    if ext not in supported:
+    if not is_supported:
         return False, f"Unsupported file type for {mode or 'this'} mode: .{ext}"
 
-    try:
-        size_mb = file_path.stat().st_size / (1024 * 1024)
-    except OSError as e:
-        return False, f"Cannot read file: {e}"
+    size_mb = file_stat.st_size / (1024 * 1024)
 
     max_mb: Optional[float] = None
     if mode == "markitdown":
@@ -1071,6 +1248,19 @@ def safe_output_stem(file_path: Path) -> str:
 # ============================================================================
 
 
+_FRONTMATTER_BASE_KEYS = frozenset({"title", "source_file", "conversion_method", "converted_at", "converter_version"})
+
+
+# json.dumps(..., ensure_ascii=False) builds a new JSONEncoder on every call;
+# one shared (stateless) encoder gives identical output for a fraction of the cost.
+_json_str_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def _yaml_scalar(value: Any) -> str:
+    """Render a frontmatter value; strings are JSON-encoded so quotes/newlines are escaped safely."""
+    return _json_str_encode(value) if isinstance(value, str) else str(value)
+
+
 def generate_yaml_frontmatter(
     title: str,
     file_name: str,
@@ -1092,28 +1282,35 @@ def generate_yaml_frontmatter(
     if not config.INCLUDE_METADATA:
         return ""
 
-    metadata: Dict[str, Any] = {
-        "title": title,
-        "source_file": file_name,
-        "conversion_method": conversion_method,
-        "converted_at": datetime.now(timezone.utc).isoformat(),
-        "converter_version": config.VERSION,
-    }
-
-    if additional_fields:
+    converted_at = datetime.now(timezone.utc).isoformat()
+    if additional_fields and not _FRONTMATTER_BASE_KEYS.isdisjoint(additional_fields):
+        # Caller overrides a base field: fall back to the generic merge so the
+        # override keeps the base field's position.
+        metadata: Dict[str, Any] = {
+            "title": title,
+            "source_file": file_name,
+            "conversion_method": conversion_method,
+            "converted_at": converted_at,
+            "converter_version": config.VERSION,
+        }
         metadata.update(additional_fields)
-
-    # Build YAML
-    # Use json.dumps for strings so quotes/newlines are escaped safely.
-    lines = ["---"]
-    for key, value in metadata.items():
-        if isinstance(value, str):
-            lines.append(f"{key}: {json.dumps(value, ensure_ascii=False)}")
-        else:
-            lines.append(f"{key}: {value}")
-    lines.append("---\n")
-
-    return "\n".join(lines)
+        return "---\n" + "".join(f"{key}: {_yaml_scalar(value)}\n" for key, value in metadata.items()) + "---\n"
+
+    # Fixed schema: fill the base fields straight into a template and only
+    # loop over the (few) caller-supplied extras.
+    extra = (
+        "".join(f"{key}: {_yaml_scalar(value)}\n" for key, value in additional_fields.items())
+        if additional_fields
+        else ""
+    )
+    return (
+        f"---\ntitle: {_yaml_scalar(title)}\n"
+        f"source_file: {_yaml_scalar(file_name)}\n"
+        f"conversion_method: {_yaml_scalar(conversion_method)}\n"
+        f"converted_at: {_yaml_scalar(converted_at)}\n"
+        f"converter_version: {_yaml_scalar(config.VERSION)}\n"
+        f"{extra}---\n"
+    )
 
 
 def strip_yaml_frontmatter(content: str) -> str: